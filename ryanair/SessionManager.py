@@ -1,16 +1,105 @@
+import threading
+from typing import Optional, Tuple, Union
+
 import requests
+from requests.adapters import HTTPAdapter
+
+# Responses with these statuses may mean our session cookie is missing or has gone stale
+SESSION_EXPIRED_STATUS_CODES = (401, 403)
+
+# Seconds to wait for a connection, and for each read from it
+DEFAULT_TIMEOUT = (5, 30)
+
+Timeout = Union[None, float, Tuple[float, float]]
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    An HTTPAdapter which applies a default timeout to requests sent without one.
+    """
+
+    def __init__(self, timeout: Timeout = DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(
+            request, timeout=self.timeout if timeout is None else timeout, **kwargs
+        )
 
 
 class SessionManager:
     BASE_SITE_FOR_SESSION_URL = "https://www.ryanair.com/ie/en"
 
-    def __init__(self):
-        self.session = requests.Session()
-        self._update_session_cookie()
+    # Session cookies are fetched lazily, and shared by every SessionManager in the process
+    _shared_cookies = None
+    _shared_cookies_generation = 0
+    _shared_cookies_lock = threading.Lock()
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        keep_alive: bool = True,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Args:
+            pool_connections (int): Number of hosts to keep connection pools for.
+            pool_maxsize (int): Connections kept open per host; at least as many as threads querying at once.
+            keep_alive (bool): Reuse connections between requests, rather than closing each after its response.
+            timeout: Default (connect, read) timeout in seconds, or one timeout for both, or None to wait forever.
+            session (requests.Session): Use this session, e.g. one with a custom transport adapter mounted, instead
+                of creating one. It's used as is, so the settings above are ignored.
+        """
+        if session is None:
+            session = requests.Session()
+            adapter = TimeoutHTTPAdapter(
+                timeout=timeout,
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if not keep_alive:
+                session.headers["Connection"] = "close"
+
+        self.session = session
+        self._cookies_generation = None
+
+    def ensure_session_cookie(self):
+        """
+        Makes sure the session has cookies, visiting the main website for them if no session in this process has yet.
+        """
+        if self._cookies_generation == SessionManager._shared_cookies_generation:
+            return
+
+        with SessionManager._shared_cookies_lock:
+            if SessionManager._shared_cookies is None:
+                self._update_session_cookie()
+            self._use_shared_cookies()
+
+    def refresh_session_cookie(self):
+        """
+        Fetches new session cookies, unless another session has already replaced the ones this one was using.
+        """
+        with SessionManager._shared_cookies_lock:
+            if self._cookies_generation == SessionManager._shared_cookies_generation:
+                self._update_session_cookie()
+            self._use_shared_cookies()
 
     def _update_session_cookie(self):
         # Visit main website to get session cookies
+        self.session.cookies.clear()
         self.session.get(self.BASE_SITE_FOR_SESSION_URL)
+        SessionManager._shared_cookies = self.session.cookies.copy()
+        SessionManager._shared_cookies_generation += 1
+
+    def _use_shared_cookies(self):
+        if SessionManager._shared_cookies is not None:
+            self.session.cookies.update(SessionManager._shared_cookies)
+        self._cookies_generation = SessionManager._shared_cookies_generation
 
     def get_session(self):
         return self.session
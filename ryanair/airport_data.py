@@ -0,0 +1,50 @@
+"""
+Conversion of airports.csv into a compact pickled form, which loads with a single unpickle instead of a CSV parse.
+
+This module must only use the standard library, as setup.py runs it at build time to generate airports.pickle.
+"""
+import csv
+import os
+import pickle
+import tempfile
+
+# Bump whenever the pickled layout changes, so stale files are rebuilt rather than misread
+FORMAT_VERSION = 1
+
+
+def read_csv(csv_path: str) -> dict:
+    """
+    Reads airports.csv into columns: "codes", "lat", "lng" and "location" lists, in file order.
+    """
+    columns = {"codes": [], "lat": [], "lng": [], "location": []}
+    with open(csv_path, newline="", encoding="utf8") as csvfile:
+        for row in csv.DictReader(csvfile):
+            columns["codes"].append(row["iata_code"])
+            columns["lat"].append(float(row["latitude_deg"]))
+            columns["lng"].append(float(row["longitude_deg"]))
+            columns["location"].append(
+                ",".join((row["iso_region"], row["iso_country"]))
+            )
+    return columns
+
+
+def compile_airports(csv_path: str, output_path: str):
+    """
+    Writes the airports in csv_path to output_path in the pickled form read by read_compiled.
+    """
+    payload = (FORMAT_VERSION, read_csv(csv_path))
+    directory = os.path.dirname(os.path.abspath(output_path))
+    # Written to a temporary file and renamed, so readers never see a partial file
+    with tempfile.NamedTemporaryFile("wb", dir=directory, delete=False) as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f.name, output_path)
+
+
+def read_compiled(path: str) -> dict:
+    with open(path, "rb") as f:
+        version, columns = pickle.load(f)
+    if version != FORMAT_VERSION:
+        raise ValueError(
+            f"{path} has format version {version}, expected {FORMAT_VERSION}"
+        )
+    return columns
@@ -1,13 +1,26 @@
+import heapq
 import os
+import tempfile
+import threading
 from dataclasses import dataclass
-from math import radians, sin, cos, asin, sqrt
+from math import radians, sin, cos, asin, sqrt, pi
 
-import csv
-from typing import Any
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from ryanair import airport_data
+from ryanair.ryanair import RyanairException, logger
 from ryanair.types import Flight
 
 AIRPORTS = None
+_AIRPORTS_LOCK = threading.Lock()
+_DATA_DIRECTORY = os.path.dirname(__file__)
+
+EARTH_RADIUS_KM = 6371
 
 
 @dataclass
@@ -19,34 +32,49 @@ class Airport:
 
 
 def load_airports():
+    """
+    The airports by IATA code, loaded on first use from the compiled airports.pickle generated at build time, or
+    from airports.csv if it's missing or out of date. Safe to call from several threads at once.
+    """
     global AIRPORTS
     if AIRPORTS is not None:
         return AIRPORTS
 
-    AIRPORTS = {}
-    try:
-        with open(
-            os.path.join(os.path.dirname(__file__), "airports.csv"),
-            newline="",
-            encoding="utf8",
-        ) as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                row: dict[str, Any] = row
-
-                iata_code = row["iata_code"]
-                location = ",".join((row["iso_region"], row["iso_country"]))
-                lat = float(row["latitude_deg"])
-                lng = float(row["longitude_deg"])
-
-                AIRPORTS[iata_code] = Airport(
-                    IATA_code=iata_code, lat=lat, lng=lng, location=location
+    with _AIRPORTS_LOCK:
+        if AIRPORTS is None:
+            try:
+                columns = _read_airport_columns()
+            except Exception as e:
+                raise RyanairException(f"Failed to load airport data: {e}") from e
+            AIRPORTS = {
+                code: Airport(IATA_code=code, lat=lat, lng=lng, location=location)
+                for code, lat, lng, location in zip(
+                    columns["codes"],
+                    columns["lat"],
+                    columns["lng"],
+                    columns["location"],
                 )
-    except Exception as e:
-        print(f"Error loading airports data: {e}")
+            }
     return AIRPORTS
 
 
+def _read_airport_columns():
+    csv_path = os.path.join(_DATA_DIRECTORY, "airports.csv")
+    compiled_path = os.path.join(_DATA_DIRECTORY, "airports.pickle")
+
+    if os.path.exists(compiled_path) and (
+        not os.path.exists(csv_path)
+        or os.path.getmtime(compiled_path) >= os.path.getmtime(csv_path)
+    ):
+        try:
+            return airport_data.read_compiled(compiled_path)
+        except Exception as e:
+            if not os.path.exists(csv_path):
+                raise
+            logger.warning(f"Ignoring unreadable {compiled_path}: {e}")
+    return airport_data.read_csv(csv_path)
+
+
 def _haversine(lat1, lon1, lat2, lon2):
     """
     Calculate the great circle distance in kilometers between two points
@@ -60,7 +88,7 @@ def _haversine(lat1, lon1, lat2, lon2):
     dlat = lat2 - lat1
     a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
     c = 2 * asin(sqrt(a))
-    r = 6371  # Radius of earth in kilometers.
+    r = EARTH_RADIUS_KM
     return c * r
 
 
@@ -69,5 +97,279 @@ def get_flight_distance(flight: Flight):
 
 
 def get_distance_between_airports(iata_a, iata_b):
-    a, b = AIRPORTS[iata_a], AIRPORTS[iata_b]
+    airports = load_airports()
+    a, b = airports[iata_a], airports[iata_b]
     return _haversine(a.lat, a.lng, b.lat, b.lng)
+
+
+_IATA_CHARACTERS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+if np is not None:
+    _IATA_DIGITS = np.full(128, -1, dtype=np.intp)
+    _IATA_DIGITS[[ord(character) for character in _IATA_CHARACTERS]] = np.arange(36)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "Batch distances require numpy, install it with `pip install ryanair-py[table]`"
+        )
+
+
+def _haversine_array(lat1, lng1, lat2, lng2):
+    # As _haversine, on arrays of coordinates in radians
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _iata_numbers(codes: "np.ndarray") -> Optional["np.ndarray"]:
+    # Three character alphanumeric codes as numbers in base 36, or None if any code isn't one
+    if codes.dtype != np.dtype("U3") or not len(codes):
+        return None
+    characters = np.ascontiguousarray(codes).view(np.uint32).reshape(len(codes), 3)
+    if characters.max() >= 128:
+        return None
+    digits = _IATA_DIGITS[characters]
+    if digits.min() < 0:
+        return None
+    return (digits[:, 0] * 36 + digits[:, 1]) * 36 + digits[:, 2]
+
+
+class AirportDistances:
+    """
+    Great circle distances between many pairs of airports at once, computed with NumPy.
+
+    Codes can be given as any sequences, including the origin and destination columns of a FareTable, e.g.
+    `table["price"] / distances.between(table["origin"], table["destination"])` for the price per km of every fare.
+    """
+
+    def __init__(self, airports: Optional[Iterable[Airport]] = None):
+        _require_numpy()
+        if airports is None:
+            airports = load_airports().values()
+        airports = sorted(airports, key=lambda airport: airport.IATA_code)
+        self.codes = np.array([airport.IATA_code for airport in airports], dtype=str)
+        self._lat = np.radians([airport.lat for airport in airports])
+        self._lng = np.radians([airport.lng for airport in airports])
+
+        # Looking codes up in a table indexed by their base 36 value is several times faster than a binary search. It
+        # can only be built if every code is a three character alphanumeric one.
+        self._index_by_number = None
+        numbers = _iata_numbers(self.codes)
+        if numbers is not None:
+            self._index_by_number = np.full(36**3, -1, dtype=np.intp)
+            self._index_by_number[numbers] = np.arange(len(self.codes))
+
+    def indices(self, codes: Sequence[str]) -> "np.ndarray":
+        """
+        Where each of the given airports is in `self.codes`; raises KeyError for unknown airports.
+        """
+        codes = np.asarray(codes, dtype=str)
+        numbers = None if self._index_by_number is None else _iata_numbers(codes)
+        if numbers is not None:
+            indices = self._index_by_number[numbers]
+            known = indices >= 0
+            if known.all():
+                return indices
+            raise KeyError(f"Unknown airports: {sorted(set(codes[~known].tolist()))}")
+
+        indices = np.searchsorted(self.codes, codes)
+        known = indices < len(self.codes)
+        known[known] = self.codes[indices[known]] == codes[known]
+        if not known.all():
+            raise KeyError(f"Unknown airports: {sorted(set(codes[~known].tolist()))}")
+        return indices
+
+    def between(
+        self, origins: Sequence[str], destinations: Sequence[str]
+    ) -> "np.ndarray":
+        """
+        The distance in km from each origin to the destination at the same position.
+        """
+        a, b = self.indices(origins), self.indices(destinations)
+        return _haversine_array(self._lat[a], self._lng[a], self._lat[b], self._lng[b])
+
+    def for_flights(self, flights: Iterable[Flight]) -> "np.ndarray":
+        flights = list(flights)
+        return self.between(
+            [flight.origin for flight in flights],
+            [flight.destination for flight in flights],
+        )
+
+    def matrix(self, path: Optional[str] = None) -> "np.ndarray":
+        """
+        The float32 distance matrix between every pair of airports, indexed like `codes`.
+
+        With a path, the matrix is saved there as an .npy file the first time, and memory-mapped read-only after
+        that, so processes share one copy through the page cache. Note it takes 4 * len(codes)^2 bytes.
+        """
+        n = len(self.codes)
+        if path is not None and os.path.exists(path):
+            matrix = np.load(path, mmap_mode="r")
+            if matrix.shape == (n, n):
+                return matrix
+
+        if path is None:
+            matrix = np.empty((n, n), dtype=np.float32)
+            self._fill_matrix(matrix)
+            return matrix
+
+        # Built in a temporary file and renamed into place, so other processes never map a partly filled matrix, and
+        # ones which have an outdated file mapped keep it intact
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(
+            dir=directory, suffix=".npy", delete=False
+        ) as f:
+            temp_path = f.name
+        try:
+            matrix = np.lib.format.open_memmap(
+                temp_path, mode="w+", dtype=np.float32, shape=(n, n)
+            )
+            self._fill_matrix(matrix)
+            matrix.flush()
+            del matrix
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return np.load(path, mmap_mode="r")
+
+    def _fill_matrix(self, matrix: "np.ndarray"):
+        # A row at a time, so building a large matrix doesn't need several times its size in temporaries
+        for i in range(len(self.codes)):
+            matrix[i] = _haversine_array(
+                self._lat[i], self._lng[i], self._lat, self._lng
+            )
+
+
+def _unit_vector(lat, lng):
+    lat, lng = radians(lat), radians(lng)
+    return cos(lat) * cos(lng), cos(lat) * sin(lng), sin(lat)
+
+
+class AirportIndex:
+    """
+    A k-d tree over the airports' positions as points on the unit sphere, for finding the airports within a radius
+    of, or nearest to, an airport or a location. The straight-line (chord) distance between points on the sphere
+    grows with the great circle distance, so it ranks and bounds them exactly.
+
+    Locations can be given as an IATA code or a (latitude, longitude) pair.
+    """
+
+    def __init__(self, airports: Optional[Iterable[Airport]] = None):
+        if airports is None:
+            airports = load_airports().values()
+        self.airports: List[Airport] = list(airports)
+        self._by_code = {airport.IATA_code: airport for airport in self.airports}
+        self._points = [_unit_vector(a.lat, a.lng) for a in self.airports]
+        # The tree is implicit: the node for the range [lo, hi) of _order is at its middle, split on _axes[middle]
+        self._order = list(range(len(self.airports)))
+        self._axes = [0] * len(self.airports)
+        self._build(0, len(self._order))
+
+    def __len__(self):
+        return len(self.airports)
+
+    def within(
+        self, location: Union[str, Tuple[float, float]], radius_km: float
+    ) -> List[Tuple[Airport, float]]:
+        """
+        The airports within radius_km of the location, with their distances in km, nearest first.
+        """
+        target = self._target(location)
+        max_chord = self._chord(radius_km)
+        found = []
+        self._within(0, len(self._order), target, max_chord**2, found)
+        return sorted(
+            ((self.airports[i], self._distance_km(d2)) for d2, i in found),
+            key=lambda result: result[1],
+        )
+
+    def nearest(
+        self, location: Union[str, Tuple[float, float]], k: int = 1
+    ) -> List[Tuple[Airport, float]]:
+        """
+        The k airports nearest the location (including the airport itself, if given by IATA code), with their
+        distances in km, nearest first.
+        """
+        target = self._target(location)
+        # A max-heap of the best k so far, by negated squared distance
+        best: List[Tuple[float, int]] = []
+        if k > 0:
+            self._nearest(0, len(self._order), target, k, best)
+        return [
+            (self.airports[i], self._distance_km(-neg_d2))
+            for neg_d2, i in sorted(best, reverse=True)
+        ]
+
+    def _target(self, location):
+        if isinstance(location, str):
+            airport = self._by_code[location]
+            return _unit_vector(airport.lat, airport.lng)
+        return _unit_vector(*location)
+
+    @staticmethod
+    def _chord(distance_km):
+        return 2 * sin(min(distance_km / EARTH_RADIUS_KM, pi) / 2)
+
+    @staticmethod
+    def _distance_km(chord_squared):
+        return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(chord_squared) / 2))
+
+    def _build(self, lo, hi):
+        if hi - lo <= 1:
+            return
+        points = [self._points[i] for i in self._order[lo:hi]]
+        # Split on the axis along which this range's points are most spread out
+        spreads = [
+            max(point[axis] for point in points) - min(point[axis] for point in points)
+            for axis in range(3)
+        ]
+        axis = spreads.index(max(spreads))
+        self._order[lo:hi] = sorted(
+            self._order[lo:hi], key=lambda i: self._points[i][axis]
+        )
+        middle = (lo + hi) // 2
+        self._axes[middle] = axis
+        self._build(lo, middle)
+        self._build(middle + 1, hi)
+
+    def _squared_distance(self, i, target):
+        x, y, z = self._points[i]
+        return (x - target[0]) ** 2 + (y - target[1]) ** 2 + (z - target[2]) ** 2
+
+    def _within(self, lo, hi, target, max_d2, found):
+        if lo >= hi:
+            return
+        middle = (lo + hi) // 2
+        i = self._order[middle]
+        d2 = self._squared_distance(i, target)
+        if d2 <= max_d2:
+            found.append((d2, i))
+
+        axis = self._axes[middle]
+        offset = target[axis] - self._points[i][axis]
+        if offset <= 0 or offset**2 <= max_d2:
+            self._within(lo, middle, target, max_d2, found)
+        if offset >= 0 or offset**2 <= max_d2:
+            self._within(middle + 1, hi, target, max_d2, found)
+
+    def _nearest(self, lo, hi, target, k, best):
+        if lo >= hi:
+            return
+        middle = (lo + hi) // 2
+        i = self._order[middle]
+        d2 = self._squared_distance(i, target)
+        if len(best) < k:
+            heapq.heappush(best, (-d2, i))
+        elif d2 < -best[0][0]:
+            heapq.heapreplace(best, (-d2, i))
+
+        axis = self._axes[middle]
+        offset = target[axis] - self._points[i][axis]
+        near, far = ((lo, middle), (middle + 1, hi))[:: 1 if offset <= 0 else -1]
+        self._nearest(*near, target, k, best)
+        if len(best) < k or offset**2 < -best[0][0]:
+            self._nearest(*far, target, k, best)
@@ -0,0 +1,260 @@
+"""
+An asyncio flavour of the Ryanair client, so that many fare queries can be in flight at once from one event loop.
+Requires the optional `httpx` dependency (`pip install ryanair-py[async]`).
+"""
+import asyncio
+import copy
+from datetime import datetime, date, time
+from time import perf_counter
+from typing import Union, Optional, Iterator
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from ryanair.SessionManager import (
+    SessionManager,
+    SESSION_EXPIRED_STATUS_CODES,
+    DEFAULT_TIMEOUT,
+)
+from ryanair.cache import Cache, request_key
+from ryanair.decoding import decode_response
+from ryanair.metrics import Metrics
+from ryanair.ratelimit import RateLimiter
+from ryanair.retry import RetryPolicy
+from ryanair.ryanair import _RyanairBase, RyanairException, logger
+from ryanair.singleflight import AsyncSingleFlight
+from ryanair.types import Flight, Trip
+
+
+class AsyncRyanair(_RyanairBase):
+    # Session cookies are fetched lazily, and shared by every AsyncRyanair in the process
+    _shared_cookies = None
+    _shared_cookies_generation = 0
+
+    def __init__(
+        self,
+        currency: Optional[str] = None,
+        client: Optional["httpx.AsyncClient"] = None,
+        cache: Optional[Cache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        if httpx is None:
+            raise ImportError(
+                "AsyncRyanair requires httpx, install it with `pip install ryanair-py[async]`"
+            )
+        super().__init__(currency, cache, rate_limiter, retry_policy, metrics)
+
+        self._owns_client = client is None
+        connect_timeout, read_timeout = DEFAULT_TIMEOUT
+        self.client = client or httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+        self._session_cookie_lock = asyncio.Lock()
+        self._session_cookie_generation = None
+        self._in_flight = AsyncSingleFlight()
+        self._retrying_send_query = self.retry_policy.wrap(
+            self._send_query,
+            logger=logger,
+            on_backoff=[self._on_query_retry],
+            on_giveup=[self._on_query_error, self._on_query_giveup],
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def get_cheapest_flights(
+        self,
+        airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        destination_country: Optional[str] = None,
+        custom_params: Optional[dict] = None,
+        departure_time_from: Union[str, time] = "00:00",
+        departure_time_to: Union[str, time] = "23:59",
+        max_price: Optional[int] = None,
+        destination_airport: Optional[str] = None,
+    ):
+        query_url, params = self._cheapest_flights_query(
+            airport,
+            date_from,
+            date_to,
+            destination_country=destination_country,
+            custom_params=custom_params,
+            departure_time_from=departure_time_from,
+            departure_time_to=departure_time_to,
+            max_price=max_price,
+            destination_airport=destination_airport,
+        )
+        return self._parse_cheapest_flights(await self._query(query_url, params))
+
+    async def get_cheapest_return_flights(
+        self,
+        source_airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        return_date_from: Union[datetime, date, str],
+        return_date_to: Union[datetime, date, str],
+        destination_country: Optional[str] = None,
+        custom_params: Optional[dict] = None,
+        outbound_departure_time_from: Union[str, time] = "00:00",
+        outbound_departure_time_to: Union[str, time] = "23:59",
+        inbound_departure_time_from: Union[str, time] = "00:00",
+        inbound_departure_time_to: Union[str, time] = "23:59",
+        max_price: Optional[int] = None,
+        destination_airport: Optional[str] = None,
+    ):
+        query_url, params = self._cheapest_return_flights_query(
+            source_airport,
+            date_from,
+            date_to,
+            return_date_from,
+            return_date_to,
+            destination_country=destination_country,
+            custom_params=custom_params,
+            outbound_departure_time_from=outbound_departure_time_from,
+            outbound_departure_time_to=outbound_departure_time_to,
+            inbound_departure_time_from=inbound_departure_time_from,
+            inbound_departure_time_to=inbound_departure_time_to,
+            max_price=max_price,
+            destination_airport=destination_airport,
+        )
+        return self._parse_cheapest_return_flights(await self._query(query_url, params))
+
+    async def iter_cheapest_flights(self, *args, **kwargs) -> Iterator[Flight]:
+        """
+        Like get_cheapest_flights, but the flights are parsed only as the returned iterator is iterated over.
+        """
+        query_url, params = self._cheapest_flights_query(*args, **kwargs)
+        return self._iter_cheapest_flights(await self._query(query_url, params))
+
+    async def iter_cheapest_return_flights(self, *args, **kwargs) -> Iterator[Trip]:
+        """
+        Like get_cheapest_return_flights, but the trips are parsed only as the returned iterator is iterated over.
+        """
+        query_url, params = self._cheapest_return_flights_query(*args, **kwargs)
+        return self._iter_cheapest_return_flights(await self._query(query_url, params))
+
+    async def _ensure_session_cookie(self):
+        if self._session_cookie_generation == AsyncRyanair._shared_cookies_generation:
+            return
+
+        async with self._session_cookie_lock:
+            if AsyncRyanair._shared_cookies is None:
+                await self._update_session_cookie()
+            self._use_shared_cookies()
+
+    async def _refresh_session_cookie(self):
+        # Unless another client has already replaced the cookies this one was using
+        async with self._session_cookie_lock:
+            generation = AsyncRyanair._shared_cookies_generation
+            if self._session_cookie_generation == generation:
+                await self._update_session_cookie()
+            self._use_shared_cookies()
+
+    async def _update_session_cookie(self):
+        # Visit main website to get session cookies
+        self.client.cookies.clear()
+        await self.client.get(SessionManager.BASE_SITE_FOR_SESSION_URL)
+        AsyncRyanair._shared_cookies = httpx.Cookies(self.client.cookies)
+        AsyncRyanair._shared_cookies_generation += 1
+
+    def _use_shared_cookies(self):
+        if AsyncRyanair._shared_cookies is not None:
+            self.client.cookies.update(AsyncRyanair._shared_cookies)
+        self._session_cookie_generation = AsyncRyanair._shared_cookies_generation
+
+    async def _query(self, url, params=None):
+        response = self._get_cached(url, params)
+        if response is None:
+            # Identical queries already in flight on other tasks share this one's response
+            response = await self._in_flight.do(
+                request_key(url, params), lambda: self._fetch(url, params)
+            )
+        return response
+
+    async def _fetch(self, url, params=None):
+        response = await self._retryable_query(url, params)
+        self._set_cached(url, params, response)
+        return response
+
+    async def _retryable_query(self, url, params=None):
+        return await self._retrying_send_query(url, params)
+
+    async def _send_query(self, url, params=None):
+        await self._ensure_session_cookie()
+
+        response = await self._get(url, params)
+        if response.status_code in SESSION_EXPIRED_STATUS_CODES:
+            # Our session cookie may have gone stale, so get a fresh one and try once more
+            self._on_session_expired(response)
+            await self._refresh_session_cookie()
+            response = await self._get(url, params)
+
+        self._check_response(response)
+        return decode_response(response)
+
+    async def _get(self, url, params=None):
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+
+        self._count_query()
+        started = perf_counter()
+        try:
+            response = await self.client.get(url, params=params)
+        except Exception:
+            self._observe_request(url, started)
+            raise
+        self._observe_request(url, started, response)
+        return response
+
+    async def get_airport_info(self, iata_code: str):
+        url = f"{AsyncRyanair.BASE_LOCATE_API_URL}autocomplete/airports"
+        params = {"phrase": iata_code, "market": "en-gb"}
+        try:
+            return copy.deepcopy(await self._query(url, params))
+        except Exception as e:
+            raise RyanairException(f"Failed to fetch airport info: {e}")
+
+    async def get_active_airports(self):
+        try:
+            return copy.deepcopy(await self._query(AsyncRyanair.ACTIVE_AIRPORTS_URL))
+        except Exception as e:
+            raise RyanairException(f"Failed to fetch active airports: {e}")
+
+    async def get_countries(self):
+        try:
+            return copy.deepcopy(await self._query(AsyncRyanair.COUNTRIES_URL))
+        except Exception as e:
+            raise RyanairException(f"Failed to fetch countries: {e}")
+
+    async def get_available_flight_dates(
+        self, departure_airport: str, arrival_airport: str
+    ):
+        """
+        Fetches available flight dates for one-way fares between two airports.
+
+        Args:
+            departure_airport (str): IATA code of the departure airport.
+            arrival_airport (str): IATA code of the arrival airport.
+
+        Returns:
+            List[str]: A list of available dates in 'YYYY-MM-DD' format.
+        """
+        url = self._available_flight_dates_url(departure_airport, arrival_airport)
+        try:
+            return copy.deepcopy(await self._query(url))
+        except Exception as e:
+            raise RyanairException(f"Failed to fetch available flight dates: {e}")
@@ -0,0 +1,112 @@
+"""
+Which days each route operates on, from the availabilities endpoint, so fare queries for dates a route has no flights
+on can be skipped instead of sent.
+"""
+import threading
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from ryanair.cache import DEFAULT_TTLS
+
+DEFAULT_TTL = DEFAULT_TTLS["availabilities"]
+
+
+class RouteAvailability:
+    """
+    The operating days of one route, as a bitset: bit i is set if there are flights first_day + i days.
+    """
+
+    __slots__ = ("first_day", "bits")
+
+    def __init__(self, days: Iterable[Union[date, str]]):
+        days = [
+            date.fromisoformat(day) if isinstance(day, str) else day for day in days
+        ]
+        self.first_day = min(days) if days else None
+        self.bits = 0
+        for day in days:
+            self.bits |= 1 << (day - self.first_day).days
+
+    def __contains__(self, day: date) -> bool:
+        if self.first_day is None or day < self.first_day:
+            return False
+        return bool(self.bits >> (day - self.first_day).days & 1)
+
+    def __len__(self) -> int:
+        return bin(self.bits).count("1")
+
+    def days(self) -> List[date]:
+        return [
+            self.first_day + timedelta(days=i)
+            for i in range(self.bits.bit_length())
+            if self.bits >> i & 1
+        ]
+
+    def narrow(self, date_from: date, date_to: date) -> Optional[Tuple[date, date]]:
+        """
+        The first and last operating days from date_from to date_to, or None if the route doesn't operate on any.
+        """
+        if self.first_day is None:
+            return None
+        start = max((date_from - self.first_day).days, 0)
+        end = (date_to - self.first_day).days
+        if end < start:
+            return None
+        window = self.bits >> start & ((1 << (end - start + 1)) - 1)
+        if not window:
+            return None
+        lowest = (window & -window).bit_length() - 1
+        return (
+            self.first_day + timedelta(days=start + lowest),
+            self.first_day + timedelta(days=start + window.bit_length() - 1),
+        )
+
+
+class AvailabilityIndex:
+    """
+    A thread-safe store of the operating days of routes, each kept for `ttl` seconds. Pass one to
+    Ryanair(availability=...) to have its fare searches skip queries for routes and dates without flights. One index
+    can be shared by several clients.
+    """
+
+    def __init__(
+        self, ttl: float = DEFAULT_TTL, clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl = ttl
+        self._clock = clock
+        self._routes: Dict[Tuple[str, str], Tuple[float, RouteAvailability]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, origin: str, destination: str) -> Optional[RouteAvailability]:
+        """
+        The route's operating days, or None if they're not known or have expired.
+        """
+        with self._lock:
+            entry = self._routes.get((origin, destination))
+            if entry is None:
+                return None
+            expires_at, availability = entry
+            if expires_at <= self._clock():
+                del self._routes[(origin, destination)]
+                return None
+            return availability
+
+    def set(
+        self, origin: str, destination: str, days: Iterable[Union[date, str]]
+    ) -> RouteAvailability:
+        availability = RouteAvailability(days)
+        with self._lock:
+            self._routes[(origin, destination)] = (
+                self._clock() + self.ttl,
+                availability,
+            )
+        return availability
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._routes)
@@ -0,0 +1,302 @@
+"""
+Response caching for the Ryanair clients, so that repeated identical queries don't each cost a network round trip.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Optional, Dict, Tuple, Callable, Union
+from urllib.parse import urlsplit
+
+# Time to live, in seconds, of cached responses for each endpoint
+DEFAULT_TTLS = {
+    "oneWayFares": 5 * 60,
+    "roundTripFares": 5 * 60,
+    "cheapestPerDay": 15 * 60,
+    "availabilities": 6 * 60 * 60,
+    "locate": 24 * 60 * 60,
+}
+DEFAULT_TTL = 5 * 60
+
+_ENDPOINTS = ("availabilities", "cheapestPerDay", "oneWayFares", "roundTripFares")
+
+
+def endpoint_name(url: str) -> str:
+    """
+    Maps an API URL onto the endpoint it belongs to, e.g. "oneWayFares" or "locate".
+    """
+    path = urlsplit(url).path
+    segments = path.rstrip("/").split("/")
+    for endpoint in _ENDPOINTS:
+        if endpoint in segments:
+            return endpoint
+    if "locate" in segments:
+        return "locate"
+    return segments[-1] or "unknown"
+
+
+def request_key(url: str, params: Optional[dict] = None) -> Tuple:
+    """
+    Normalises a query into a hashable key, independent of the order params were added in.
+    """
+    if not params:
+        return url, ()
+    return url, tuple(sorted((str(k), str(v)) for k, v in params.items()))
+
+
+def _response_size(response: Any) -> int:
+    return len(json.dumps(response, separators=(",", ":")))
+
+
+class ResponseCache:
+    """
+    A thread-safe in-memory cache of decoded API responses, with a per-endpoint TTL and LRU eviction once either
+    the entry or byte budget is exceeded.
+
+    Cached responses are shared between callers, so they must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 1024,
+        max_bytes: Optional[int] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self._clock = clock
+
+        self._entries: "OrderedDict[Tuple, Tuple[float, int, Any]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def ttl_for(self, url: str) -> float:
+        return self.ttls.get(endpoint_name(url), self.default_ttl)
+
+    def get(self, url: str, params: Optional[dict] = None) -> Optional[Any]:
+        key = request_key(url, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, response = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def set(self, url: str, params: Optional[dict], response: Any):
+        ttl = self.ttl_for(url)
+        if response is None or ttl <= 0:
+            return
+        size = _response_size(response) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        key = request_key(url, params)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self._clock() + ttl, size, response)
+            self._size += size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    def _evict(self):
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._size > self.max_bytes)
+        ):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._size -= size
+
+
+class SQLiteResponseCache:
+    """
+    A disk-backed cache of API responses in an SQLite database, which survives restarts and can be shared by
+    several worker processes on the same host.
+
+    Responses are stored zlib-compressed with the time they were fetched and when they expire. Once the total
+    stored size exceeds max_bytes, the oldest responses are evicted first. The total is kept up to date by triggers,
+    so checking it doesn't scan the table on every write.
+    """
+
+    _SCHEMA = """
+        BEGIN;
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            endpoint TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            size INTEGER NOT NULL,
+            body BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_fetched_at ON responses (fetched_at);
+        CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at);
+
+        CREATE TABLE IF NOT EXISTS responses_size (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            total INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO responses_size
+            SELECT 0, COALESCE(SUM(size), 0) FROM responses;
+        CREATE TRIGGER IF NOT EXISTS responses_size_insert AFTER INSERT ON responses BEGIN
+            UPDATE responses_size SET total = total + NEW.size;
+        END;
+        CREATE TRIGGER IF NOT EXISTS responses_size_update AFTER UPDATE OF size ON responses BEGIN
+            UPDATE responses_size SET total = total - OLD.size + NEW.size;
+        END;
+        CREATE TRIGGER IF NOT EXISTS responses_size_delete AFTER DELETE ON responses BEGIN
+            UPDATE responses_size SET total = total - OLD.size;
+        END;
+        COMMIT;
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        timeout: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.timeout = timeout
+        self._clock = clock
+
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.executescript(self._SCHEMA)
+
+    def ttl_for(self, url: str) -> float:
+        return self.ttls.get(endpoint_name(url), self.default_ttl)
+
+    def get(self, url: str, params: Optional[dict] = None) -> Optional[Any]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT expires_at, body FROM responses WHERE key = ?",
+                (self._key(url, params),),
+            )
+            .fetchone()
+        )
+        if row is None or row[0] <= self._clock():
+            return None
+        return json.loads(zlib.decompress(row[1]))
+
+    def set(self, url: str, params: Optional[dict], response: Any):
+        ttl = self.ttl_for(url)
+        if response is None or ttl <= 0:
+            return
+        body = zlib.compress(json.dumps(response, separators=(",", ":")).encode())
+        if self.max_bytes is not None and len(body) > self.max_bytes:
+            return
+
+        now = self._clock()
+        with self._connection() as connection:
+            # An upsert rather than INSERT OR REPLACE, whose implicit deletes don't fire the size triggers
+            connection.execute(
+                """
+                INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    endpoint = excluded.endpoint,
+                    fetched_at = excluded.fetched_at,
+                    expires_at = excluded.expires_at,
+                    size = excluded.size,
+                    body = excluded.body
+                """,
+                (
+                    self._key(url, params),
+                    endpoint_name(url),
+                    now,
+                    now + ttl,
+                    len(body),
+                    body,
+                ),
+            )
+            self._evict(connection, now)
+
+    def clear(self):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def __len__(self):
+        return (
+            self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        )
+
+    @property
+    def size_bytes(self) -> int:
+        return (
+            self._connection().execute("SELECT total FROM responses_size").fetchone()[0]
+        )
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @staticmethod
+    def _key(url, params):
+        return json.dumps(request_key(url, params))
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads, so each thread gets its own
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        connection.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        if self.max_bytes is None:
+            return
+
+        total = connection.execute("SELECT total FROM responses_size").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Walks the fetched_at index only as far as needed
+        evict = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM responses ORDER BY fetched_at"
+        ):
+            if total <= self.max_bytes:
+                break
+            evict.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM responses WHERE key = ?", evict)
+
+
+Cache = Union[ResponseCache, SQLiteResponseCache]
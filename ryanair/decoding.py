@@ -0,0 +1,42 @@
+"""
+Decoding of API responses and the timestamps in them. JSON is decoded with orjson when it's installed
+(`pip install ryanair-py[fast]`), which is several times faster than the standard library on large fare responses,
+falling back to the response's own decoder otherwise.
+"""
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+
+def decode_response(response) -> Any:
+    """
+    Decodes the JSON body of a requests or httpx response.
+    """
+    if orjson is not None:
+        content = getattr(response, "content", None)
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return orjson.loads(content)
+    return response.json()
+
+
+# Departure times repeat heavily within and across responses (the same slot to many destinations, and on both legs of
+# trips), and datetimes are immutable, so parsed ones are shared.
+@lru_cache(maxsize=8192)
+def parse_datetime(timestamp: str) -> datetime:
+    return datetime.fromisoformat(timestamp)
+
+
+@lru_cache(maxsize=8192)
+def epoch_seconds(timestamp: str) -> int:
+    """
+    Seconds since the epoch of an API timestamp, taken as is (the API gives local times without a zone).
+    """
+    return (parse_datetime(timestamp).replace(tzinfo=None) - _EPOCH) // _SECOND
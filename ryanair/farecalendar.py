@@ -0,0 +1,99 @@
+"""
+Per-day cheapest fares on a route, as given by the cheapestPerDay endpoints, and the search for the cheapest pair of
+outbound and return days over them.
+"""
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+# Fares by day, in day order, with only the days on which a fare is available
+FareCalendar = Dict[date, "DayFare"]
+
+
+@dataclass
+class DayFare:
+    __slots__ = ("day", "price", "currency", "departureTime", "arrivalTime")
+
+    day: date
+    price: float
+    currency: str
+    departureTime: datetime
+    arrivalTime: datetime
+
+
+@dataclass
+class DayPair:
+    __slots__ = ("totalPrice", "outbound", "inbound")
+
+    totalPrice: float
+    outbound: DayFare
+    inbound: DayFare
+
+
+def best_pairs(
+    outbound: FareCalendar,
+    inbound: FareCalendar,
+    min_days: int = 1,
+    max_days: Optional[int] = None,
+) -> List[DayPair]:
+    """
+    Finds, for every outbound day, the cheapest return day between min_days and max_days days later (unlimited if
+    max_days is None). A return on the same day (min_days=0) only counts if it leaves after the outbound flight lands.
+
+    Runs in time linear in the number of days: the range of return days slides forward one day at a time, with its
+    cheapest day kept at the front of a deque of days in increasing order of price.
+
+    Returns:
+        list: The cheapest pair for each outbound day which has one, in day order. The cheapest of all is
+        min(pairs, key=lambda pair: pair.totalPrice).
+    """
+    if max_days is not None and max_days < min_days:
+        return []
+
+    return_days = sorted(inbound)
+    window = deque()
+    pushed = 0
+    pairs = []
+    for day in sorted(outbound):
+        out = outbound[day]
+        first = day + timedelta(days=max(min_days, 1))
+        last = None if max_days is None else day + timedelta(days=max_days)
+
+        while pushed < len(return_days) and (
+            last is None or return_days[pushed] <= last
+        ):
+            # Days that are both earlier and pricier than this one can never be the cheapest again
+            price = inbound[return_days[pushed]].price
+            while window and inbound[window[-1]].price > price:
+                window.pop()
+            window.append(return_days[pushed])
+            pushed += 1
+        while window and window[0] < first:
+            window.popleft()
+
+        best = inbound[window[0]] if window else None
+        if min_days == 0:
+            same_day = inbound.get(day)
+            if (
+                same_day is not None
+                and same_day.departureTime > out.arrivalTime
+                and (best is None or same_day.price < best.price)
+            ):
+                best = same_day
+
+        if best is not None:
+            pairs.append(DayPair(out.price + best.price, out, best))
+    return pairs
+
+
+def months_between(date_from: date, date_to: date) -> List[date]:
+    """
+    The first day of each month from date_from's to date_to's, inclusive.
+    """
+    months = []
+    month = date_from.replace(day=1)
+    while month <= date_to:
+        months.append(month)
+        month = (month + timedelta(days=32)).replace(day=1)
+    return months
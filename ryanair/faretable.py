@@ -0,0 +1,238 @@
+"""
+A columnar container for large numbers of fares, so they can be filtered, sorted and ranked with vectorised NumPy
+operations rather than Python loops. Requires the optional `numpy` dependency (`pip install ryanair-py[table]`).
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from ryanair.decoding import epoch_seconds, _EPOCH, _SECOND
+from ryanair.types import Flight, Trip
+
+
+def _datetime_column(values: List[datetime]) -> "np.ndarray":
+    # Several times faster than having NumPy convert each datetime itself. Times are kept as the local (wall clock)
+    # times the API gives them in.
+    seconds = np.fromiter(
+        (
+            ((value if value.tzinfo is None else value.replace(tzinfo=None)) - _EPOCH)
+            // _SECOND
+            for value in values
+        ),
+        dtype=np.int64,
+        count=len(values),
+    )
+    return seconds.view("datetime64[s]")
+
+
+def _sort_key(column: "np.ndarray") -> "np.ndarray":
+    # Codes of up to three characters pack into one integer with the same ordering, which sorts far faster
+    if column.dtype.kind == "U" and column.dtype.itemsize <= 12:
+        width = column.dtype.itemsize // 4
+        chars = np.zeros((len(column), 3), dtype=np.uint64)
+        codes = np.ascontiguousarray(column).view(np.uint32)
+        chars[:, :width] = codes.reshape(len(column), width)
+        return (chars[:, 0] << 42) | (chars[:, 1] << 21) | chars[:, 2]
+    return column
+
+
+class FareTable:
+    """
+    Fares held as NumPy columns, one row per flight or trip:
+
+    - origin, destination, currency: IATA and currency codes
+    - departure_time: outbound departure, as datetime64[s]
+    - price: the fare, or the total price of a trip
+    - return_departure_time, duration: inbound departure, and time between departures (trips only)
+
+    Operations return a new table rather than modifying this one. The Flight or Trip each row came from is
+    available from items().
+    """
+
+    def __init__(
+        self, columns: Dict[str, "np.ndarray"], items: Optional["np.ndarray"] = None
+    ):
+        if np is None:
+            raise ImportError(
+                "FareTable requires numpy, install it with `pip install ryanair-py[table]`"
+            )
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+
+        self.columns = columns
+        self._items = items
+
+    @classmethod
+    def from_flights(cls, flights: Iterable[Flight]) -> "FareTable":
+        flights = list(flights)
+        return cls(cls._flight_columns(flights), cls._object_array(flights))
+
+    @classmethod
+    def from_flights_response(cls, response: dict) -> "FareTable":
+        """
+        Builds the table straight from a decoded oneWayFares response, without creating Flight objects.
+        """
+        fares = response["fares"] or []
+        return cls(cls._fare_columns([fare["outbound"] for fare in fares]))
+
+    @classmethod
+    def from_trips_response(cls, response: dict) -> "FareTable":
+        """
+        Builds the table straight from a decoded roundTripFares response, without creating Trip objects.
+        """
+        fares = response["fares"] or []
+        columns = cls._fare_columns([fare["outbound"] for fare in fares])
+        columns["price"] += np.fromiter(
+            (fare["inbound"]["price"]["value"] for fare in fares),
+            dtype=np.float64,
+            count=len(fares),
+        )
+        columns["return_departure_time"] = cls._timestamp_column(
+            [fare["inbound"]["departureDate"] for fare in fares]
+        )
+        columns["duration"] = (
+            columns["return_departure_time"] - columns["departure_time"]
+        )
+        return cls(columns)
+
+    @classmethod
+    def from_trips(cls, trips: Iterable[Trip]) -> "FareTable":
+        trips = list(trips)
+        columns = cls._flight_columns([trip.outbound for trip in trips])
+        columns["price"] = np.fromiter(
+            (trip.totalPrice for trip in trips), dtype=np.float64, count=len(trips)
+        )
+        columns["return_departure_time"] = _datetime_column(
+            [trip.inbound.departureTime for trip in trips]
+        )
+        columns["duration"] = (
+            columns["return_departure_time"] - columns["departure_time"]
+        )
+        return cls(columns, cls._object_array(trips))
+
+    def __len__(self):
+        return len(self.columns["price"])
+
+    def __getitem__(self, column: str) -> "np.ndarray":
+        return self.columns[column]
+
+    def items(self) -> List[Union[Flight, Trip]]:
+        """
+        The Flight or Trip objects the rows were built from, in row order.
+        """
+        if self._items is None:
+            raise ValueError("This table wasn't built from Flight or Trip objects")
+        return self._items.tolist()
+
+    def take(self, indices: "np.ndarray") -> "FareTable":
+        """
+        The rows at the given indices (or boolean mask), in that order.
+        """
+        return FareTable(
+            {name: column[indices] for name, column in self.columns.items()},
+            None if self._items is None else self._items[indices],
+        )
+
+    def filter(self, mask: "np.ndarray") -> "FareTable":
+        """
+        The rows where mask is true, e.g. table.filter(table["price"] < 50).
+        """
+        return self.take(np.asarray(mask, dtype=bool))
+
+    def sort(self, by: str = "price", descending: bool = False) -> "FareTable":
+        order = np.argsort(self.columns[by], kind="stable")
+        return self.take(order[::-1] if descending else order)
+
+    def top_k(
+        self, k: int, by: str = "price", where: Optional["np.ndarray"] = None
+    ) -> "FareTable":
+        """
+        The k rows with the lowest values of a column, e.g. the k cheapest fares, in order.
+        Passing a mask as `where` only considers the rows where it's true, without building a filtered table first.
+        """
+        rows = np.arange(len(self)) if where is None else np.flatnonzero(where)
+        values = self.columns[by][rows]
+        if k < len(values):
+            candidates = np.argpartition(values, k)[:k]
+            rows = rows[candidates]
+            values = values[candidates]
+        return self.take(rows[np.argsort(values, kind="stable")])
+
+    def group_by(self, column: str = "destination") -> Dict[str, "FareTable"]:
+        """
+        Splits the table by the values of a column, e.g. one table per destination.
+        """
+        values = self.columns[column]
+        order = np.argsort(_sort_key(values), kind="stable")
+        if not len(order):
+            return {}
+        keys = values[order]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        ends = np.append(starts[1:], len(order))
+        return {
+            keys[start].item(): self.take(order[start:end])
+            for start, end in zip(starts, ends)
+        }
+
+    def cheapest_by(self, column: str = "destination") -> "FareTable":
+        """
+        The cheapest row for each value of a column, e.g. the cheapest fare to each destination.
+        """
+        order = np.argsort(self.columns["price"], kind="stable")
+        _, first = np.unique(_sort_key(self.columns[column])[order], return_index=True)
+        return self.take(order[first]).sort()
+
+    @staticmethod
+    def _flight_columns(flights: List[Flight]) -> Dict[str, "np.ndarray"]:
+        return {
+            "origin": np.array([f.origin for f in flights], dtype="U3"),
+            "destination": np.array([f.destination for f in flights], dtype="U3"),
+            "departure_time": _datetime_column([f.departureTime for f in flights]),
+            "price": np.fromiter(
+                (f.price for f in flights), dtype=np.float64, count=len(flights)
+            ),
+            "currency": np.array([f.currency for f in flights], dtype="U3"),
+        }
+
+    @classmethod
+    def _fare_columns(cls, fares: List[dict]) -> Dict[str, "np.ndarray"]:
+        return {
+            "origin": np.array(
+                [fare["departureAirport"]["iataCode"] for fare in fares], dtype="U3"
+            ),
+            "destination": np.array(
+                [fare["arrivalAirport"]["iataCode"] for fare in fares], dtype="U3"
+            ),
+            "departure_time": cls._timestamp_column(
+                [fare["departureDate"] for fare in fares]
+            ),
+            "price": np.fromiter(
+                (fare["price"]["value"] for fare in fares),
+                dtype=np.float64,
+                count=len(fares),
+            ),
+            "currency": np.array(
+                [fare["price"]["currencyCode"] for fare in fares], dtype="U3"
+            ),
+        }
+
+    @staticmethod
+    def _timestamp_column(timestamps: List[str]) -> "np.ndarray":
+        # Kept as integer epoch seconds throughout, without creating datetimes
+        seconds = np.fromiter(
+            (epoch_seconds(timestamp) for timestamp in timestamps),
+            dtype=np.int64,
+            count=len(timestamps),
+        )
+        return seconds.view("datetime64[s]")
+
+    @staticmethod
+    def _object_array(items: list) -> "np.ndarray":
+        array = np.empty(len(items), dtype=object)
+        array[:] = items
+        return array
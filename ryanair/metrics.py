@@ -0,0 +1,136 @@
+"""
+Per-endpoint instrumentation of API queries, so a slow sweep can be put down to latency, retries, payload sizes or
+our own processing. Exportable as a dict, or in the Prometheus text format for scraping.
+"""
+import bisect
+import threading
+from typing import Dict, Optional, Sequence
+
+# Upper bounds, in seconds, of the request latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_COUNTERS = (
+    ("requests", "HTTP requests sent"),
+    ("errors", "HTTP requests which failed without a response"),
+    ("response_bytes", "Bytes of response bodies received"),
+    ("retries", "Queries retried after a transient failure"),
+    ("giveups", "Queries which failed after their last attempt"),
+    ("cache_hits", "Queries answered from the response cache"),
+    ("cache_misses", "Queries not found in the response cache"),
+    ("pruned", "Queries skipped as the route has no flights on their dates"),
+)
+
+
+class _EndpointMetrics:
+    __slots__ = tuple(name for name, _ in _COUNTERS) + (
+        "latency_buckets",
+        "latency_sum",
+    )
+
+    def __init__(self, num_buckets: int):
+        for name, _ in _COUNTERS:
+            setattr(self, name, 0)
+        # The last bucket counts requests slower than every bound
+        self.latency_buckets = [0] * (num_buckets + 1)
+        self.latency_sum = 0.0
+
+
+class Metrics:
+    """
+    Thread-safe counters and latency histograms of the queries made by a client, per endpoint
+    (e.g. "oneWayFares" or "locate"). One instance can be shared by several clients.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self._endpoints: Dict[str, _EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def observe_request(
+        self, endpoint: str, seconds: float, response_bytes: Optional[int] = None
+    ):
+        """
+        Records an HTTP request which took the given time. Without a response size, it's counted as an error.
+        """
+        bucket = bisect.bisect_left(self.latency_buckets, seconds)
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            metrics.requests += 1
+            metrics.latency_buckets[bucket] += 1
+            metrics.latency_sum += seconds
+            if response_bytes is None:
+                metrics.errors += 1
+            else:
+                metrics.response_bytes += response_bytes
+
+    def increment(self, endpoint: str, counter: str):
+        """
+        Adds one to a counter, e.g. "retries" or "cache_hits".
+        """
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            setattr(metrics, counter, getattr(metrics, counter) + 1)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_dict(self) -> Dict[str, dict]:
+        """
+        A snapshot of every endpoint's counters, with the latency histogram as cumulative counts keyed by upper bound.
+        """
+        with self._lock:
+            return {
+                endpoint: self._snapshot(metrics)
+                for endpoint, metrics in sorted(self._endpoints.items())
+            }
+
+    def to_prometheus(self, prefix: str = "ryanair") -> str:
+        """
+        The metrics in the Prometheus text exposition format.
+        """
+        snapshot = self.to_dict()
+        lines = []
+        for name, description in _COUNTERS:
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} counter")
+            for endpoint, metrics in snapshot.items():
+                lines.append(f'{metric}{{endpoint="{endpoint}"}} {metrics[name]}')
+
+        metric = f"{prefix}_request_duration_seconds"
+        lines.append(f"# HELP {metric} Latency of HTTP requests")
+        lines.append(f"# TYPE {metric} histogram")
+        for endpoint, metrics in snapshot.items():
+            for bound, count in metrics["latency"]["buckets"].items():
+                lines.append(
+                    f'{metric}_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}'
+                )
+            lines.append(
+                f'{metric}_sum{{endpoint="{endpoint}"}} {metrics["latency"]["sum"]}'
+            )
+            lines.append(
+                f'{metric}_count{{endpoint="{endpoint}"}} {metrics["requests"]}'
+            )
+        return "\n".join(lines) + "\n"
+
+    def _endpoint(self, endpoint: str) -> _EndpointMetrics:
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = _EndpointMetrics(
+                len(self.latency_buckets)
+            )
+        return metrics
+
+    def _snapshot(self, metrics: _EndpointMetrics) -> dict:
+        buckets = {}
+        total = 0
+        for bound, count in zip(
+            self.latency_buckets + ("+Inf",), metrics.latency_buckets
+        ):
+            total += count
+            buckets[str(bound)] = total
+
+        snapshot = {name: getattr(metrics, name) for name, _ in _COUNTERS}
+        snapshot["latency"] = {"buckets": buckets, "sum": metrics.latency_sum}
+        return snapshot
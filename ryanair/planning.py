@@ -0,0 +1,270 @@
+"""
+Planning of fare queries: splitting wide date windows into shards which can be fetched concurrently, merging their
+results back together, and collapsing many overlapping queries into a few covering ones.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from ryanair.types import Flight, Trip
+
+DateRange = Tuple[date, date]
+T = TypeVar("T", Flight, Trip)
+
+
+def to_date(d: Union[datetime, date, str]) -> date:
+    if isinstance(d, str):
+        return date.fromisoformat(d)
+    if isinstance(d, datetime):
+        return d.date()
+    return d
+
+
+def shard_date_range(
+    date_from: Union[datetime, date, str],
+    date_to: Union[datetime, date, str],
+    shard_days: int,
+) -> List[DateRange]:
+    """
+    Splits the inclusive range date_from..date_to into consecutive, non-overlapping inclusive ranges of at most
+    shard_days days each.
+    """
+    if shard_days < 1:
+        raise ValueError(f"shard_days must be at least 1, not {shard_days}")
+
+    start, end = to_date(date_from), to_date(date_to)
+    step = timedelta(days=shard_days)
+    shards = []
+    while start <= end:
+        shards.append((start, min(start + step - timedelta(days=1), end)))
+        start += step
+    return shards
+
+
+def shard_return_windows(
+    date_from: Union[datetime, date, str],
+    date_to: Union[datetime, date, str],
+    return_date_from: Union[datetime, date, str],
+    return_date_to: Union[datetime, date, str],
+    shard_days: int,
+    return_shard_days: int = None,
+) -> List[Tuple[DateRange, DateRange]]:
+    """
+    Splits outbound and return windows into pairs of (outbound, return) shards which together cover every combination
+    of outbound and return dates in the original windows. Pairs whose return shard ends before their outbound shard
+    starts can't hold any trip, so are left out.
+    """
+    return_shards = shard_date_range(
+        return_date_from, return_date_to, return_shard_days or shard_days
+    )
+    return [
+        (outbound, inbound)
+        for outbound in shard_date_range(date_from, date_to, shard_days)
+        for inbound in return_shards
+        if inbound[1] >= outbound[0]
+    ]
+
+
+def flight_destination(flight: Flight) -> str:
+    return flight.destination
+
+
+def trip_destination(trip: Trip) -> str:
+    return trip.outbound.destination
+
+
+def _price(fare: Union[Flight, Trip]) -> float:
+    return fare.totalPrice if isinstance(fare, Trip) else fare.price
+
+
+def _departure_time(fare: Union[Flight, Trip]) -> datetime:
+    return fare.outbound.departureTime if isinstance(fare, Trip) else fare.departureTime
+
+
+def merge_fares(
+    results: Iterable[Iterable[T]],
+    key: Callable[[T], Hashable] = None,
+) -> List[T]:
+    """
+    Merges the flights or trips from several queries into one list, ordered by price (then departure time).
+
+    Args:
+        results: The flights or trips returned by each query.
+        key: If given, only the cheapest fare for each key is kept, e.g. flight_destination to keep the cheapest
+            flight to each destination, as a single query over the whole window would have returned. Otherwise
+            fares returned by more than one query are kept once.
+    """
+    if key is None:
+        fares = list(
+            {fare.freeze(): fare for fares in results for fare in fares}.values()
+        )
+    else:
+        cheapest = {}
+        for fares in results:
+            for fare in fares:
+                k = key(fare)
+                best = cheapest.get(k)
+                if best is None or (_price(fare), _departure_time(fare)) < (
+                    _price(best),
+                    _departure_time(best),
+                ):
+                    cheapest[k] = fare
+        fares = list(cheapest.values())
+
+    fares.sort(key=lambda fare: (_price(fare), _departure_time(fare)))
+    return fares
+
+
+@dataclass(frozen=True)
+class FareQuery:
+    """
+    A one-way (without an inbound window) or return fare query, in a hashable form which query planning can compare
+    and combine. Build them with FareQuery.one_way or FareQuery.round_trip.
+
+    options holds the remaining keyword arguments of get_cheapest_flights or get_cheapest_return_flights, such as
+    max_price or destination_country, as sorted (name, value) pairs.
+    """
+
+    origin: str
+    outbound: DateRange
+    inbound: Optional[DateRange] = None
+    options: Tuple[Tuple[str, Any], ...] = ()
+
+    @classmethod
+    def one_way(
+        cls,
+        airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        **options,
+    ) -> "FareQuery":
+        return cls(
+            airport, (to_date(date_from), to_date(date_to)), None, _freeze(options)
+        )
+
+    @classmethod
+    def round_trip(
+        cls,
+        source_airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        return_date_from: Union[datetime, date, str],
+        return_date_to: Union[datetime, date, str],
+        **options,
+    ) -> "FareQuery":
+        return cls(
+            source_airport,
+            (to_date(date_from), to_date(date_to)),
+            (to_date(return_date_from), to_date(return_date_to)),
+            _freeze(options),
+        )
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        return {
+            name: dict(value) if name == "custom_params" else value
+            for name, value in self.options
+        }
+
+    def contains(self, fare: Union[Flight, Trip]) -> bool:
+        """
+        Whether the flight or trip departs within this query's date windows.
+        """
+        if isinstance(fare, Trip):
+            return _within(fare.outbound.departureTime, self.outbound) and (
+                self.inbound is not None
+                and _within(fare.inbound.departureTime, self.inbound)
+            )
+        return self.inbound is None and _within(fare.departureTime, self.outbound)
+
+
+def _freeze(options: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    return tuple(
+        sorted(
+            (name, tuple(sorted(value.items())) if isinstance(value, dict) else value)
+            for name, value in options.items()
+            if value is not None
+        )
+    )
+
+
+def _within(departure_time: datetime, window: DateRange) -> bool:
+    return window[0] <= departure_time.date() <= window[1]
+
+
+def _span(window: DateRange) -> int:
+    return (window[1] - window[0]).days + 1
+
+
+def _bounds(a: Optional[DateRange], b: Optional[DateRange]) -> Optional[DateRange]:
+    if a is None:
+        return None
+    return min(a[0], b[0]), max(a[1], b[1])
+
+
+def plan_covering_queries(
+    queries: Sequence[FareQuery], max_days: int
+) -> List[Tuple[FareQuery, List[int]]]:
+    """
+    Collapses queries whose date windows overlap or lie close together into covering queries, each spanning the
+    windows of the queries it covers. Only queries from the same origin, of the same kind and with the same options
+    are combined, and no covering window is allowed to span more than max_days days.
+
+    Returns:
+        list: (covering query, indices of the queries it covers) pairs. Every query is covered exactly once.
+    """
+
+    groups: Dict[Hashable, List[int]] = {}
+    for i, query in enumerate(queries):
+        key = query.origin, query.inbound is None, query.options
+        groups.setdefault(key, []).append(i)
+
+    def start(i):
+        return queries[i].outbound[0], queries[i].inbound or ()
+
+    plan = []
+    for members in groups.values():
+        cover, covered = None, []
+        for i in sorted(members, key=start):
+            query = queries[i]
+            if cover is not None:
+                outbound = _bounds(cover.outbound, query.outbound)
+                inbound = _bounds(cover.inbound, query.inbound)
+                if _span(outbound) <= max_days and (
+                    inbound is None or _span(inbound) <= max_days
+                ):
+                    cover = FareQuery(query.origin, outbound, inbound, query.options)
+                    covered.append(i)
+                    continue
+                plan.append((cover, covered))
+            cover, covered = query, [i]
+        plan.append((cover, covered))
+    return plan
+
+
+def answer_from_cover(query: FareQuery, fares: Iterable[T]) -> Tuple[List[T], bool]:
+    """
+    Answers a query from the response to a query covering it, by keeping the fares within its own windows.
+
+    The API returns the cheapest fare to each destination over the whole covering window, so each fare kept is the
+    right answer for its destination. A destination whose cheapest fare over the covering window lies outside this
+    query's windows may still be reachable within them though, at a higher price, so is missing from the answer.
+
+    Returns:
+        tuple: The fares within the query's windows, and whether that answer is complete, i.e. every fare was.
+    """
+    fares = list(fares)
+    answer = [fare for fare in fares if query.contains(fare)]
+    return answer, len(answer) == len(fares)
@@ -0,0 +1,119 @@
+"""
+Watching fares for changes: the fares of each query are compared with the ones it returned last time, so repeated
+polls only yield the fares which were added, removed or repriced since.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+ADDED = "added"
+REMOVED = "removed"
+REPRICED = "repriced"
+
+_LEGS = ("outbound", "inbound")
+
+
+@dataclass
+class FareChange:
+    """
+    A fare which appeared (ADDED), disappeared (REMOVED) or changed price (REPRICED) since the last poll. `old` is None
+    for added fares, and `new` for removed ones.
+    """
+
+    __slots__ = ("kind", "key", "old", "new")
+
+    kind: str
+    key: Tuple[str, ...]
+    old: Optional[Any]
+    new: Optional[Any]
+
+
+def fare_key(fare: dict) -> Tuple[str, ...]:
+    """
+    Identifies a fare from the API by its flights' keys: one for one-way fares, outbound and inbound for return ones.
+    """
+    return tuple(
+        fare[leg].get("flightKey")
+        or f"{fare[leg]['flightNumber']}~{fare[leg]['departureDate']}"
+        for leg in _LEGS
+        if fare.get(leg)
+    )
+
+
+def _fare_price(fare: dict) -> Tuple:
+    return tuple(fare[leg]["price"]["value"] for leg in _LEGS if fare.get(leg))
+
+
+def _fare_version(fare: dict) -> Tuple:
+    return tuple(
+        (fare[leg].get("priceUpdated"), fare[leg]["price"]["value"])
+        for leg in _LEGS
+        if fare.get(leg)
+    )
+
+
+class PriceWatch:
+    """
+    The last fares seen for each query, to tell what changed since. A fare whose flights' `priceUpdated` timestamps and
+    prices are the same as last time isn't parsed again, so a poll costs in proportion to the number of changes rather
+    than the number of fares. Thread-safe, and a query can be any hashable key.
+    """
+
+    def __init__(self):
+        # query -> fare key -> (version, raw price, parsed fare)
+        self._snapshots: Dict[Hashable, Dict[Tuple, Tuple[Tuple, Tuple, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def update(
+        self, query: Hashable, fares: Iterable[dict], parse: Callable[[dict], Any]
+    ) -> List[FareChange]:
+        """
+        Replaces the snapshot of the query with the fares given (as returned by the API), and returns how they differ
+        from the previous one. Each new or repriced fare is parsed with `parse`. On the first poll of a query, every
+        fare is added.
+        """
+        with self._lock:
+            previous = self._snapshots.get(query, {})
+            snapshot = {}
+            changes = []
+            for fare in fares:
+                key = fare_key(fare)
+                version = _fare_version(fare)
+                seen = previous.get(key)
+                if seen is not None and seen[0] == version:
+                    snapshot[key] = seen
+                    continue
+
+                price = _fare_price(fare)
+                if seen is not None and seen[1] == price:
+                    # Only the timestamp moved, so the parsed fare is still current
+                    snapshot[key] = (version, price, seen[2])
+                    continue
+
+                parsed = parse(fare)
+                snapshot[key] = (version, price, parsed)
+                if seen is None:
+                    changes.append(FareChange(ADDED, key, None, parsed))
+                else:
+                    changes.append(FareChange(REPRICED, key, seen[2], parsed))
+
+            for key, (_, _, parsed) in previous.items():
+                if key not in snapshot:
+                    changes.append(FareChange(REMOVED, key, parsed, None))
+            self._snapshots[query] = snapshot
+            return changes
+
+    def forget(self, query: Hashable):
+        """
+        Drops the snapshot of the query, so its next poll reports every fare as added.
+        """
+        with self._lock:
+            self._snapshots.pop(query, None)
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._snapshots)
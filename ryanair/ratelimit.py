@@ -0,0 +1,94 @@
+"""
+Client-side rate limiting, so queries are spread out to stay under the API's limits instead of tripping them.
+"""
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+# Responses with these statuses mean we are sending requests too quickly
+THROTTLED_STATUS_CODES = (429, 403)
+
+
+class RateLimiter:
+    """
+    A token bucket, safe to share between threads and asyncio tasks (and between clients), which allows `burst`
+    requests at once and `rate` requests per second on average.
+
+    The rate adapts to the API's responses: it is cut by `decrease_factor` whenever a request is throttled, and
+    recovers by `increase` requests per second with each successful one, up to the configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int = 5,
+        min_rate: float = 0.2,
+        decrease_factor: float = 0.5,
+        increase: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+
+        self.max_rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self.decrease_factor = decrease_factor
+        self.increase = rate / 20 if increase is None else increase
+        self._clock = clock
+
+        self._rate = rate
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def acquire(self):
+        """
+        Blocks the calling thread until a request may be sent.
+        """
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """
+        Waits, without blocking the event loop, until a request may be sent.
+        """
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_throttled(self):
+        with self._lock:
+            self._refill()
+            self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+            # Don't let a saved up burst go straight back out
+            self._tokens = min(self._tokens, 0.0)
+
+    def on_success(self):
+        if self._rate >= self.max_rate:
+            return
+        with self._lock:
+            self._refill()
+            self._rate = min(self.max_rate, self._rate + self.increase)
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._updated_at) * self._rate
+        )
+        self._updated_at = now
+
+    def _reserve(self) -> float:
+        # Take a token now, even if that leaves the bucket in debt, and wait until it would have been available
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
@@ -0,0 +1,190 @@
+"""
+Retry policy for API queries: only transient failures are retried, with jittered exponential backoff which honours
+Retry-After, and a per-client retry budget so that a widespread outage fails fast instead of multiplying load.
+"""
+import inspect
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, Optional
+
+import backoff
+import requests
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+# HTTP statuses worth retrying; any other error status means the query itself is at fault
+RETRYABLE_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+
+_TRANSIENT_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+_HTTP_STATUS_EXCEPTIONS = (requests.HTTPError,)
+if httpx is not None:
+    _TRANSIENT_EXCEPTIONS += (httpx.TransportError,)
+    _HTTP_STATUS_EXCEPTIONS += (httpx.HTTPStatusError,)
+
+
+def _status_code(exception: Exception) -> Optional[int]:
+    response = getattr(exception, "response", None)
+    status_code = getattr(response, "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def retry_after(exception: Exception) -> Optional[float]:
+    """
+    The number of seconds the server asked us to wait before retrying, if it did.
+    """
+    response = getattr(exception, "response", None)
+    headers = getattr(response, "headers", None)
+    try:
+        value = headers.get("Retry-After") if headers is not None else None
+    except Exception:
+        return None
+    if not isinstance(value, str):
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def is_transient(exception: Exception) -> bool:
+    """
+    Whether retrying could help: connection problems, timeouts, server errors and rate limiting.
+    """
+    status_code = _status_code(exception)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+    if isinstance(exception, _HTTP_STATUS_EXCEPTIONS):
+        # We can't tell what the status was, so assume it's worth another try
+        return True
+    return isinstance(exception, _TRANSIENT_EXCEPTIONS)
+
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of the traffic sent: each query earns `ratio` of a retry, and each retry spends a
+    whole one. Up to `max_tokens` retries can be saved up, so occasional failures are always retried.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    Decides which failed queries to retry, and how long to wait before each retry.
+
+    Args:
+        max_tries (int): Maximum number of attempts per query, including the first.
+        base (float): Wait before the first retry, in seconds, doubling with each further retry.
+        cap (float): Maximum backoff, in seconds. Waits are drawn uniformly from zero up to the backoff (full jitter).
+        max_retry_after (float): Give up immediately if the server asks us to wait longer than this.
+        budget (RetryBudget): Shared across all queries made with this policy. Defaults to a RetryBudget().
+    """
+
+    def __init__(
+        self,
+        max_tries: int = 5,
+        base: float = 1.0,
+        cap: float = 30.0,
+        max_retry_after: float = 60.0,
+        budget: Optional[RetryBudget] = None,
+    ):
+        self.max_tries = max_tries
+        self.base = base
+        self.cap = cap
+        self.max_retry_after = max_retry_after
+        self.budget = budget or RetryBudget()
+
+    def wrap(
+        self,
+        function: Callable,
+        logger=None,
+        on_backoff: Iterable[Callable] = (),
+        on_giveup: Iterable[Callable] = (),
+    ) -> Callable:
+        """
+        Wraps a function (or coroutine function) making a single attempt at a query, so it is retried per this policy.
+        """
+        retrying = backoff.on_exception(
+            self._waits,
+            Exception,
+            max_tries=self.max_tries,
+            jitter=None,
+            giveup=lambda e: not is_transient(e),
+            logger=logger,
+            raise_on_giveup=True,
+            on_backoff=list(on_backoff),
+            on_giveup=list(on_giveup),
+        )(function)
+
+        budget = self.budget
+        if inspect.iscoroutinefunction(function):
+
+            async def budgeted(*args, **kwargs):
+                budget.deposit()
+                return await retrying(*args, **kwargs)
+
+        else:
+
+            def budgeted(*args, **kwargs):
+                budget.deposit()
+                return retrying(*args, **kwargs)
+
+        return budgeted
+
+    def backoff_for(self, retry: int) -> float:
+        """
+        The jittered wait before the given retry (1 for the first).
+        """
+        return random.uniform(0, min(self.cap, self.base * 2 ** (retry - 1)))
+
+    def _waits(self):
+        # backoff sends in the exception which caused each retry
+        retry = 0
+        exception = yield
+        while True:
+            retry += 1
+            server_wait = retry_after(exception)
+            if server_wait is not None and server_wait > self.max_retry_after:
+                return
+            if not self.budget.withdraw():
+                return
+            wait = self.backoff_for(retry)
+            if server_wait is not None:
+                wait = max(wait, server_wait)
+            exception = yield wait
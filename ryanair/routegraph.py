@@ -0,0 +1,214 @@
+"""
+The route network as a graph of airports, and the search for the cheapest itineraries with self-transfers (one or
+more separately booked connecting flights) over it.
+"""
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Set, Tuple
+
+from ryanair.farecalendar import DayFare
+
+# Self-transfers aren't protected, so allow time to collect bags and check in again
+DEFAULT_MIN_CONNECTION = timedelta(hours=2)
+DEFAULT_MAX_LAYOVER = timedelta(hours=24)
+
+
+@dataclass
+class Leg:
+    """
+    The cheapest flight on a route on one day.
+    """
+
+    __slots__ = (
+        "origin",
+        "destination",
+        "price",
+        "currency",
+        "departureTime",
+        "arrivalTime",
+    )
+
+    origin: str
+    destination: str
+    price: float
+    currency: str
+    departureTime: datetime
+    arrivalTime: datetime
+
+    @classmethod
+    def from_day_fare(cls, origin: str, destination: str, fare: DayFare) -> "Leg":
+        return cls(
+            origin,
+            destination,
+            fare.price,
+            fare.currency,
+            fare.departureTime,
+            fare.arrivalTime,
+        )
+
+
+@dataclass
+class Itinerary:
+    __slots__ = ("totalPrice", "legs")
+
+    totalPrice: float
+    legs: Tuple[Leg, ...]
+
+    @property
+    def stops(self) -> int:
+        return len(self.legs) - 1
+
+    @property
+    def departureTime(self) -> datetime:
+        return self.legs[0].departureTime
+
+    @property
+    def arrivalTime(self) -> datetime:
+        return self.legs[-1].arrivalTime
+
+
+class RouteGraph:
+    """
+    Which airports each airport has routes to.
+    """
+
+    def __init__(self, routes: Mapping[str, Iterable[str]]):
+        self._destinations: Dict[str, FrozenSet[str]] = {
+            origin: frozenset(destinations) for origin, destinations in routes.items()
+        }
+        origins: Dict[str, Set[str]] = {}
+        for origin, destinations in self._destinations.items():
+            for destination in destinations:
+                origins.setdefault(destination, set()).add(origin)
+        self._origins = {
+            destination: frozenset(airports)
+            for destination, airports in origins.items()
+        }
+
+    @classmethod
+    def from_active_airports(cls, airports: Iterable[dict]) -> "RouteGraph":
+        """
+        Builds the graph from the response of Ryanair.get_active_airports, whose routes are listed per airport as
+        "airport:<IATA code>" entries (alongside "country:..." and "city:..." ones).
+        """
+        return cls(
+            {
+                airport["code"]: [
+                    route.split(":", 1)[1]
+                    for route in airport.get("routes") or ()
+                    if route.startswith("airport:")
+                ]
+                for airport in airports
+            }
+        )
+
+    def __len__(self) -> int:
+        return len(self._destinations)
+
+    def destinations(self, origin: str) -> FrozenSet[str]:
+        return self._destinations.get(origin, frozenset())
+
+    def routes_between(
+        self, origin: str, destination: str, max_stops: int
+    ) -> List[Tuple[str, str]]:
+        """
+        Every route which is part of some way from origin to destination with at most max_stops stops.
+        """
+        max_legs = max_stops + 1
+        from_origin = self._distances(origin, self._destinations, max_legs)
+        to_destination = self._distances(destination, self._origins, max_legs)
+        return [
+            (a, b)
+            for a, hops in from_origin.items()
+            for b in self.destinations(a)
+            if b in to_destination and hops + 1 + to_destination[b] <= max_legs
+        ]
+
+    @staticmethod
+    def _distances(
+        start: str, neighbours: Dict[str, FrozenSet[str]], limit: int
+    ) -> Dict[str, int]:
+        # Breadth first, in number of flights
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            airport = queue.popleft()
+            if distances[airport] == limit:
+                continue
+            for neighbour in neighbours.get(airport, ()):
+                if neighbour not in distances:
+                    distances[neighbour] = distances[airport] + 1
+                    queue.append(neighbour)
+        return distances
+
+
+def cheapest_itineraries(
+    legs: Iterable[Leg],
+    origin: str,
+    destination: str,
+    date_from: date,
+    date_to: date,
+    max_stops: int = 2,
+    min_connection: timedelta = DEFAULT_MIN_CONNECTION,
+    max_layover: timedelta = DEFAULT_MAX_LAYOVER,
+    limit: int = 10,
+) -> List[Itinerary]:
+    """
+    Finds the cheapest itineraries from origin to destination, leaving from date_from to date_to, made up of the legs
+    given. Each connection must leave at least min_connection and at most max_layover after the previous flight lands,
+    and no airport is visited twice.
+
+    A label-setting (Dijkstra) search over the legs, ordered by total price: itineraries come off the queue cheapest
+    first, so the search stops as soon as `limit` have reached the destination. Once the legs are fetched, that takes
+    milliseconds.
+
+    Returns:
+        list: Up to `limit` itineraries, cheapest first.
+    """
+    departures: Dict[str, List[Leg]] = {}
+    for leg in legs:
+        departures.setdefault(leg.origin, []).append(leg)
+    times = {}
+    for airport, airport_legs in departures.items():
+        airport_legs.sort(key=lambda leg: leg.departureTime)
+        times[airport] = [leg.departureTime for leg in airport_legs]
+
+    # (total price, tie breaker, legs so far)
+    queue = []
+    counter = 0
+    for leg in departures.get(origin, ()):
+        if date_from <= leg.departureTime.date() <= date_to:
+            queue.append((leg.price, counter, (leg,)))
+            counter += 1
+    heapq.heapify(queue)
+
+    # As with k shortest paths, each leg is settled up to `limit` times, by its cheapest `limit` ways there. Any
+    # further way to it can't be part of one of the `limit` cheapest itineraries.
+    settled: Dict[int, int] = {}
+    itineraries = []
+    while queue and len(itineraries) < limit:
+        price, _, path = heapq.heappop(queue)
+        last = path[-1]
+        if settled.get(id(last), 0) >= limit:
+            continue
+        settled[id(last)] = settled.get(id(last), 0) + 1
+
+        if last.destination == destination:
+            itineraries.append(Itinerary(price, path))
+            continue
+        if len(path) > max_stops:
+            continue
+
+        visited = {leg.origin for leg in path}
+        airport_legs = departures.get(last.destination, ())
+        airport_times = times.get(last.destination, ())
+        start = bisect_left(airport_times, last.arrivalTime + min_connection)
+        end = bisect_right(airport_times, last.arrivalTime + max_layover)
+        for leg in airport_legs[start:end]:
+            if leg.destination not in visited:
+                heapq.heappush(queue, (price + leg.price, counter, path + (leg,)))
+                counter += 1
+    return itineraries
@@ -2,14 +2,28 @@
 This module allows you to retrieve the cheapest flights, with or without return flights, within a fixed set of dates.
 This is done directly through Ryanair's API, and does not require an API key.
 """
+import copy
 import logging
 import sys
-from datetime import datetime, date, time
-from typing import Union, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, date, time, timedelta
+from functools import lru_cache
+from time import monotonic, perf_counter
+from typing import Union, Optional, Iterable, Iterator, Callable, Tuple, Dict, List
 
-import backoff
-
-from ryanair.SessionManager import SessionManager
+from ryanair import farecalendar, planning, routegraph, tripjoin
+from ryanair.SessionManager import SessionManager, SESSION_EXPIRED_STATUS_CODES
+from ryanair.availability import AvailabilityIndex
+from ryanair.cache import Cache, DEFAULT_TTLS, request_key, endpoint_name
+from ryanair.decoding import decode_response, parse_datetime
+from ryanair.farecalendar import FareCalendar, DayFare, DayPair
+from ryanair.metrics import Metrics
+from ryanair.pricewatch import FareChange, PriceWatch
+from ryanair.ratelimit import RateLimiter, THROTTLED_STATUS_CODES
+from ryanair.retry import RetryPolicy
+from ryanair.routegraph import Itinerary, Leg, RouteGraph
+from ryanair.singleflight import SingleFlight
 from ryanair.types import Flight, Trip
 
 logger = logging.getLogger("ryanair")
@@ -25,25 +39,98 @@ if not logger.handlers:
     logger.addHandler(console_handler)
 
 
+@lru_cache(maxsize=4096)
+def _airport_full_name(name: str, country_name: str) -> str:
+    # A few hundred airports appear over and over, so their names are shared rather than rebuilt for every fare
+    return f"{name}, {country_name}"
+
+
 class RyanairException(Exception):
     def __init__(self, message):
         super().__init__(f"Ryanair API: {message}")
 
 
-# noinspection PyBroadException
-class Ryanair:
+class _RyanairBase:
+    """
+    Query building and response parsing shared by the blocking and asyncio clients.
+    """
+
     BASE_SERVICES_API_URL = "https://services-api.ryanair.com/farfnd/v4/"
     BASE_LOCATE_API_URL = "https://www.ryanair.com/api/locate/v1/"
+    BASE_AVAILABILITY_API_URL = "https://www.ryanair.com/api/farfnd/v4/"
+    ACTIVE_AIRPORTS_URL = (
+        "https://www.ryanair.com/api/views/locate/3/airports/en/active"
+    )
+    COUNTRIES_URL = "https://www.ryanair.com/api/views/locate/3/countries/en"
 
-
-    def __init__(self, currency: Optional[str] = None):
+    def __init__(
+        self,
+        currency: Optional[str] = None,
+        cache: Optional[Cache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        metrics: Optional[Metrics] = None,
+    ):
         self.currency = currency
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or self._get_default_retry_policy()
+        self.metrics = metrics or Metrics()
 
         self._num_queries = 0
-        self.session_manager = SessionManager()
-        self.session = self.session_manager.get_session()
+        self._num_cache_hits = 0
+        self._num_cache_misses = 0
+        self._counters_lock = threading.Lock()
 
-    def get_cheapest_flights(
+    def _count_query(self):
+        with self._counters_lock:
+            self._num_queries += 1
+
+    def _get_cached(self, url, params):
+        if self.cache is None:
+            return None
+
+        response = self.cache.get(url, params)
+        with self._counters_lock:
+            if response is None:
+                self._num_cache_misses += 1
+            else:
+                self._num_cache_hits += 1
+        self.metrics.increment(
+            endpoint_name(url), "cache_misses" if response is None else "cache_hits"
+        )
+        return response
+
+    def _set_cached(self, url, params, response):
+        if self.cache is not None:
+            self.cache.set(url, params, response)
+
+    def _observe_request(self, url, started, response=None):
+        size = None
+        if response is not None:
+            content = getattr(response, "content", None)
+            size = len(content) if isinstance(content, (bytes, bytearray)) else 0
+        self.metrics.observe_request(endpoint_name(url), perf_counter() - started, size)
+
+    def _check_response(self, response):
+        if self.rate_limiter is not None and (
+            response.status_code in THROTTLED_STATUS_CODES
+        ):
+            self.rate_limiter.on_throttled()
+
+        response.raise_for_status()
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_success()
+
+    def _on_session_expired(self, response):
+        # A 403 may also mean we're being throttled, so slow down before trying again
+        if self.rate_limiter is not None and (
+            response.status_code in THROTTLED_STATUS_CODES
+        ):
+            self.rate_limiter.on_throttled()
+
+    def _cheapest_flights_query(
         self,
         airport: str,
         date_from: Union[datetime, date, str],
@@ -55,7 +142,7 @@ class Ryanair:
         max_price: Optional[int] = None,
         destination_airport: Optional[str] = None,
     ):
-        query_url = "".join((Ryanair.BASE_SERVICES_API_URL, "oneWayFares"))
+        query_url = "".join((self.BASE_SERVICES_API_URL, "oneWayFares"))
 
         params = {
             "departureAirportIataCode": airport,
@@ -75,16 +162,9 @@ class Ryanair:
         if custom_params:
             params.update(custom_params)
 
-        response = self._retryable_query(query_url, params)["fares"]
-
-        if response:
-            return [
-                self._parse_cheapest_flight(flight["outbound"]) for flight in response
-            ]
+        return query_url, params
 
-        return []
-
-    def get_cheapest_return_flights(
+    def _cheapest_return_flights_query(
         self,
         source_airport: str,
         date_from: Union[datetime, date, str],
@@ -100,7 +180,7 @@ class Ryanair:
         max_price: Optional[int] = None,
         destination_airport: Optional[str] = None,
     ):
-        query_url = "".join((Ryanair.BASE_SERVICES_API_URL, "roundTripFares"))
+        query_url = "".join((self.BASE_SERVICES_API_URL, "roundTripFares"))
 
         params = {
             "departureAirportIataCode": source_airport,
@@ -132,18 +212,54 @@ class Ryanair:
         if custom_params:
             params.update(custom_params)
 
-        response = self._retryable_query(query_url, params)["fares"]
+        return query_url, params
+
+    def _cheapest_per_day_query(self, origin: str, destination: str, month: date):
+        query_url = "".join(
+            (
+                self.BASE_SERVICES_API_URL,
+                f"oneWayFares/{origin}/{destination}/cheapestPerDay",
+            )
+        )
+
+        params = {"outboundMonthOfDate": self._format_date_for_api(month)}
+        if self.currency:
+            params["currency"] = self.currency
+
+        return query_url, params
+
+    def _parse_cheapest_per_day(self, response) -> FareCalendar:
+        calendar = {}
+        for fare in response["outbound"]["fares"] or ():
+            price = fare.get("price")
+            if price is None or fare.get("unavailable") or fare.get("soldOut"):
+                continue
+            day = date.fromisoformat(fare["day"])
+            calendar[day] = DayFare(
+                day=day,
+                price=price["value"],
+                currency=sys.intern(price["currencyCode"]),
+                departureTime=parse_datetime(fare["departureDate"]),
+                arrivalTime=parse_datetime(fare["arrivalDate"]),
+            )
+        return calendar
+
+    def _parse_cheapest_flights(self, response):
+        return list(self._iter_cheapest_flights(response))
+
+    def _parse_cheapest_return_flights(self, response):
+        return list(self._iter_cheapest_return_flights(response))
+
+    def _iter_cheapest_flights(self, response) -> Iterator[Flight]:
+        for flight in response["fares"] or ():
+            yield self._parse_cheapest_flight(flight["outbound"])
+
+    def _iter_cheapest_return_flights(self, response) -> Iterator[Trip]:
+        for trip in response["fares"] or ():
+            yield self._parse_cheapest_return_flights_as_trip(
+                trip["outbound"], trip["inbound"]
+            )
 
-        if response:
-            return [
-                self._parse_cheapest_return_flights_as_trip(
-                    trip["outbound"], trip["inbound"]
-                )
-                for trip in response
-            ]
-        else:
-            return []
-    
     @staticmethod
     def get_airports_by_country(country_code: str, exclude_airports: list = None) -> list:
         """
@@ -204,29 +320,21 @@ class Ryanair:
         return airports
 
     @staticmethod
-    def _get_backoff_type():
+    def _get_default_retry_policy():
         if "unittest" in sys.modules.keys():
-            return backoff.constant(interval=0)
+            return RetryPolicy(base=0)
 
-        return backoff.expo()
+        return RetryPolicy()
 
     @staticmethod
     def _on_query_error(e):
         logger.exception(f"Gave up retrying query, last exception was {e}")
 
-    @backoff.on_exception(
-        _get_backoff_type,
-        Exception,
-        max_tries=5,
-        logger=logger,
-        raise_on_giveup=True,
-        on_giveup=_on_query_error,
-    )
-    def _retryable_query(self, url, params=None):
-        self._num_queries += 1
-        response = self.session.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+    def _on_query_retry(self, details):
+        self.metrics.increment(endpoint_name(details["args"][0]), "retries")
+
+    def _on_query_giveup(self, details):
+        self.metrics.increment(endpoint_name(details["args"][0]), "giveups")
 
     def _parse_cheapest_flight(self, flight):
         currency = flight["price"]["currencyCode"]
@@ -234,25 +342,22 @@ class Ryanair:
             logger.warning(
                 f"Requested cheapest flights in {self.currency} but API responded with fares in {currency}"
             )
+        departure_airport = flight["departureAirport"]
+        arrival_airport = flight["arrivalAirport"]
+        flight_number = flight["flightNumber"]
         return Flight(
-            origin=flight["departureAirport"]["iataCode"],
-            originFull=", ".join(
-                (
-                    flight["departureAirport"]["name"],
-                    flight["departureAirport"]["countryName"],
-                )
+            origin=sys.intern(departure_airport["iataCode"]),
+            originFull=_airport_full_name(
+                departure_airport["name"], departure_airport["countryName"]
             ),
-            destination=flight["arrivalAirport"]["iataCode"],
-            destinationFull=", ".join(
-                (
-                    flight["arrivalAirport"]["name"],
-                    flight["arrivalAirport"]["countryName"],
-                )
+            destination=sys.intern(arrival_airport["iataCode"]),
+            destinationFull=_airport_full_name(
+                arrival_airport["name"], arrival_airport["countryName"]
             ),
-            departureTime=datetime.fromisoformat(flight["departureDate"]),
-            flightNumber=f"{flight['flightNumber'][:2]} {flight['flightNumber'][2:]}",
+            departureTime=parse_datetime(flight["departureDate"]),
+            flightNumber=f"{flight_number[:2]} {flight_number[2:]}",
             price=flight["price"]["value"],
-            currency=currency,
+            currency=sys.intern(currency),
         )
 
     def _parse_cheapest_return_flights_as_trip(self, outbound, inbound):
@@ -285,28 +390,767 @@ class Ryanair:
             return t.strftime("%H:%M")
 
     @property
-    def num_queries(self) -> __init__:
+    def num_queries(self) -> int:
         return self._num_queries
 
+    @property
+    def num_cache_hits(self) -> int:
+        return self._num_cache_hits
+
+    @property
+    def num_cache_misses(self) -> int:
+        return self._num_cache_misses
+
+    def _available_flight_dates_url(self, departure_airport: str, arrival_airport: str):
+        return (
+            f"{self.BASE_AVAILABILITY_API_URL}oneWayFares/"
+            f"{departure_airport}/{arrival_airport}/availabilities"
+        )
+
+
+# noinspection PyBroadException
+class Ryanair(_RyanairBase):
+    DEFAULT_MAX_WORKERS = 8
+    DEFAULT_SHARD_DAYS = 7
+    DEFAULT_MAX_COVER_DAYS = 31
+
+    def __init__(
+        self,
+        currency: Optional[str] = None,
+        cache: Optional[Cache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        session_manager: Optional[SessionManager] = None,
+        metrics: Optional[Metrics] = None,
+        availability: Optional[AvailabilityIndex] = None,
+        price_watch: Optional[PriceWatch] = None,
+    ):
+        super().__init__(currency, cache, rate_limiter, retry_policy, metrics)
+
+        self.availability = availability
+        self.price_watch = price_watch or PriceWatch()
+        self._route_graph = None
+        self._route_graph_lock = threading.Lock()
+        self.session_manager = session_manager or SessionManager()
+        self.session = self.session_manager.get_session()
+        self._in_flight = SingleFlight()
+        self._retrying_send_query = self.retry_policy.wrap(
+            self._send_query,
+            logger=logger,
+            on_backoff=[self._on_query_retry],
+            on_giveup=[self._on_query_error, self._on_query_giveup],
+        )
+
+    def get_cheapest_flights(
+        self,
+        airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        destination_country: Optional[str] = None,
+        custom_params: Optional[dict] = None,
+        departure_time_from: Union[str, time] = "00:00",
+        departure_time_to: Union[str, time] = "23:59",
+        max_price: Optional[int] = None,
+        destination_airport: Optional[str] = None,
+    ):
+        query_url, params = self._cheapest_flights_query(
+            airport,
+            date_from,
+            date_to,
+            destination_country=destination_country,
+            custom_params=custom_params,
+            departure_time_from=departure_time_from,
+            departure_time_to=departure_time_to,
+            max_price=max_price,
+            destination_airport=destination_airport,
+        )
+        return self._parse_cheapest_flights(self._query_fares(query_url, params))
+
+    def get_cheapest_return_flights(
+        self,
+        source_airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        return_date_from: Union[datetime, date, str],
+        return_date_to: Union[datetime, date, str],
+        destination_country: Optional[str] = None,
+        custom_params: Optional[dict] = None,
+        outbound_departure_time_from: Union[str, time] = "00:00",
+        outbound_departure_time_to: Union[str, time] = "23:59",
+        inbound_departure_time_from: Union[str, time] = "00:00",
+        inbound_departure_time_to: Union[str, time] = "23:59",
+        max_price: Optional[int] = None,
+        destination_airport: Optional[str] = None,
+    ):
+        query_url, params = self._cheapest_return_flights_query(
+            source_airport,
+            date_from,
+            date_to,
+            return_date_from,
+            return_date_to,
+            destination_country=destination_country,
+            custom_params=custom_params,
+            outbound_departure_time_from=outbound_departure_time_from,
+            outbound_departure_time_to=outbound_departure_time_to,
+            inbound_departure_time_from=inbound_departure_time_from,
+            inbound_departure_time_to=inbound_departure_time_to,
+            max_price=max_price,
+            destination_airport=destination_airport,
+        )
+        return self._parse_cheapest_return_flights(self._query_fares(query_url, params))
+
+    def iter_cheapest_flights(self, *args, **kwargs) -> Iterator[Flight]:
+        """
+        Like get_cheapest_flights, but parses each flight only as it's iterated over, so stopping early (e.g. after
+        the first few matching a filter) skips parsing the rest. The query itself is made straight away.
+        """
+        query_url, params = self._cheapest_flights_query(*args, **kwargs)
+        return self._iter_cheapest_flights(self._query_fares(query_url, params))
+
+    def iter_cheapest_return_flights(self, *args, **kwargs) -> Iterator[Trip]:
+        """
+        Like get_cheapest_return_flights, but parses each trip only as it's iterated over.
+        """
+        query_url, params = self._cheapest_return_flights_query(*args, **kwargs)
+        return self._iter_cheapest_return_flights(self._query_fares(query_url, params))
+
+    def watch_cheapest_flights(self, *args, **kwargs) -> List[FareChange]:
+        """
+        Like get_cheapest_flights, but returns only the fares added, removed or repriced since the last call with the
+        same arguments (every fare is added on the first one), with the flights as they were before and after. Fares
+        unchanged since are not parsed again.
+
+        With a cache, calls within its TTL get the same response, so no changes.
+        """
+        query_url, params = self._cheapest_flights_query(*args, **kwargs)
+        return self.price_watch.update(
+            request_key(query_url, params),
+            self._query_fares(query_url, params)["fares"] or (),
+            lambda fare: self._parse_cheapest_flight(fare["outbound"]),
+        )
+
+    def watch_cheapest_return_flights(self, *args, **kwargs) -> List[FareChange]:
+        """
+        Like watch_cheapest_flights, for get_cheapest_return_flights: the changes are to trips, repriced if either
+        flight is.
+        """
+        query_url, params = self._cheapest_return_flights_query(*args, **kwargs)
+        return self.price_watch.update(
+            request_key(query_url, params),
+            self._query_fares(query_url, params)["fares"] or (),
+            lambda fare: self._parse_cheapest_return_flights_as_trip(
+                fare["outbound"], fare["inbound"]
+            ),
+        )
+
+    def get_cheapest_flights_many(
+        self,
+        airports: Iterable[str],
+        *args,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        **kwargs,
+    ) -> Dict[str, List[Flight]]:
+        """
+        Runs get_cheapest_flights for several departure airports concurrently.
+        Any further arguments are passed through to get_cheapest_flights.
+
+        Args:
+            airports (Iterable[str]): IATA codes of the departure airports.
+            max_workers (int): Maximum number of queries in flight at once.
+
+        Returns:
+            dict: The cheapest flights for each departure airport, in the order given.
+        """
+        airports = list(airports)
+        results = dict(
+            self.iter_cheapest_flights_many(
+                airports, *args, max_workers=max_workers, **kwargs
+            )
+        )
+        return {airport: results[airport] for airport in airports}
+
+    def iter_cheapest_flights_many(
+        self,
+        airports: Iterable[str],
+        *args,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        **kwargs,
+    ) -> Iterator[Tuple[str, List[Flight]]]:
+        """
+        Like get_cheapest_flights_many, but yields (airport, flights) pairs as each query completes.
+
+        Exhaust the iterator or close it (e.g. with contextlib.closing) when done with it, as queries still pending are
+        only cancelled, and the worker threads only released, once it finishes.
+        """
+        return self._fan_out(
+            lambda airport: self.get_cheapest_flights(airport, *args, **kwargs),
+            airports,
+            max_workers,
+        )
+
+    def get_cheapest_return_flights_many(
+        self,
+        source_airports: Iterable[str],
+        *args,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        **kwargs,
+    ) -> Dict[str, List[Trip]]:
+        """
+        Runs get_cheapest_return_flights for several source airports concurrently.
+        Any further arguments are passed through to get_cheapest_return_flights.
+
+        Args:
+            source_airports (Iterable[str]): IATA codes of the source airports.
+            max_workers (int): Maximum number of queries in flight at once.
+
+        Returns:
+            dict: The cheapest trips for each source airport, in the order given.
+        """
+        source_airports = list(source_airports)
+        results = dict(
+            self.iter_cheapest_return_flights_many(
+                source_airports, *args, max_workers=max_workers, **kwargs
+            )
+        )
+        return {airport: results[airport] for airport in source_airports}
+
+    def iter_cheapest_return_flights_many(
+        self,
+        source_airports: Iterable[str],
+        *args,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        **kwargs,
+    ) -> Iterator[Tuple[str, List[Trip]]]:
+        """
+        Like get_cheapest_return_flights_many, but yields (airport, trips) pairs as each query completes.
+
+        Exhaust the iterator or close it (e.g. with contextlib.closing) when done with it, as queries still pending are
+        only cancelled, and the worker threads only released, once it finishes.
+        """
+        return self._fan_out(
+            lambda airport: self.get_cheapest_return_flights(airport, *args, **kwargs),
+            source_airports,
+            max_workers,
+        )
+
+    def get_cheapest_flights_sharded(
+        self,
+        airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        *args,
+        shard_days: int = DEFAULT_SHARD_DAYS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        cheapest_per_destination: bool = True,
+        **kwargs,
+    ) -> List[Flight]:
+        """
+        Like get_cheapest_flights, but splits a wide date window into shards of shard_days days, which are queried
+        concurrently, so the search takes as long as the slowest shard rather than one large response.
+        Any further arguments are passed through to get_cheapest_flights.
+
+        Args:
+            shard_days (int): Number of days of the window covered by each query.
+            max_workers (int): Maximum number of queries in flight at once.
+            cheapest_per_destination (bool): Keep only the cheapest flight to each destination, as a single query
+                over the whole window would return. Otherwise the cheapest flights of every shard are kept.
+
+        Returns:
+            list: The merged flights, cheapest first.
+        """
+        shards = planning.shard_date_range(date_from, date_to, shard_days)
+        results = dict(
+            self._fan_out(
+                lambda shard: self.get_cheapest_flights(
+                    airport, shard[0], shard[1], *args, **kwargs
+                ),
+                shards,
+                max_workers,
+            )
+        )
+        return planning.merge_fares(
+            (results[shard] for shard in shards),
+            key=planning.flight_destination if cheapest_per_destination else None,
+        )
+
+    def get_cheapest_return_flights_sharded(
+        self,
+        source_airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        return_date_from: Union[datetime, date, str],
+        return_date_to: Union[datetime, date, str],
+        *args,
+        shard_days: int = DEFAULT_SHARD_DAYS,
+        return_shard_days: Optional[int] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        cheapest_per_destination: bool = True,
+        **kwargs,
+    ) -> List[Trip]:
+        """
+        Like get_cheapest_return_flights, but splits wide outbound and return windows into shards which are queried
+        concurrently. Every pair of outbound and return shards which could hold a trip is queried.
+        Any further arguments are passed through to get_cheapest_return_flights.
+
+        Args:
+            shard_days (int): Number of days of the outbound window covered by each query.
+            return_shard_days (int): Number of days of the return window covered by each query, shard_days if not
+                given.
+            max_workers (int): Maximum number of queries in flight at once.
+            cheapest_per_destination (bool): Keep only the cheapest trip to each destination, as a single query over
+                the whole windows would return. Otherwise the cheapest trips of every pair of shards are kept.
+
+        Returns:
+            list: The merged trips, cheapest first.
+        """
+        shards = planning.shard_return_windows(
+            date_from,
+            date_to,
+            return_date_from,
+            return_date_to,
+            shard_days,
+            return_shard_days,
+        )
+        results = dict(
+            self._fan_out(
+                lambda shard: self.get_cheapest_return_flights(
+                    source_airport, *shard[0], *shard[1], *args, **kwargs
+                ),
+                shards,
+                max_workers,
+            )
+        )
+        return planning.merge_fares(
+            (results[shard] for shard in shards),
+            key=planning.trip_destination if cheapest_per_destination else None,
+        )
+
+    def get_cheapest_fares_batch(
+        self,
+        queries: Iterable[planning.FareQuery],
+        exact: bool = True,
+        max_days: int = DEFAULT_MAX_COVER_DAYS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> List[list]:
+        """
+        Answers a batch of queries, such as one per start date and trip length, with as few API calls as possible.
+        Queries with overlapping or nearby date windows are collapsed into covering queries spanning at most max_days
+        days, which are run concurrently, and each query is answered by keeping the covering fares within its windows.
+
+        The API returns the cheapest fare to each destination, so a covering query only finds, for each destination,
+        its cheapest fare over the whole covering window. A destination whose cheapest covering fare fell outside a
+        query's windows may still have fares within them, so such queries are run on their own, unless exact is False.
+        Batches of narrow, similar windows save the most calls; ones like a sweep of trip lengths, where most answers
+        are incomplete, can cost more calls than running the queries separately.
+
+        Args:
+            queries (Iterable[FareQuery]): The queries, built with FareQuery.one_way or FareQuery.round_trip.
+            exact (bool): Run a query on its own whenever its answer from the covering query may be missing a
+                destination, so every answer matches running the queries one by one. If False, such answers are
+                returned as they are: every fare in them is right, but destinations may be missing.
+            max_days (int): Maximum number of days spanned by a covering query's outbound or return window.
+            max_workers (int): Maximum number of queries in flight at once.
+
+        Returns:
+            list: The flights or trips for each query, in the order given.
+        """
+        queries = list(queries)
+        plan = planning.plan_covering_queries(queries, max_days)
+        responses = dict(
+            self._fan_out(
+                self._run_fare_query, [cover for cover, _ in plan], max_workers
+            )
+        )
+
+        results = [None] * len(queries)
+        for cover, covered in plan:
+            if len(covered) == 1:
+                # Not combined with any other query, so this is the query's own response
+                results[covered[0]] = responses[cover]
+                continue
+            for i in covered:
+                answer, complete = planning.answer_from_cover(
+                    queries[i], responses[cover]
+                )
+                if complete or not exact:
+                    results[i] = answer
+
+        incomplete = [
+            query for query, result in zip(queries, results) if result is None
+        ]
+        if incomplete:
+            responses = dict(
+                self._fan_out(self._run_fare_query, incomplete, max_workers)
+            )
+            results = [
+                responses[query] if result is None else result
+                for query, result in zip(queries, results)
+            ]
+        return results
+
+    def get_cheapest_return_flights_joined(
+        self,
+        source_airport: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        return_date_from: Union[datetime, date, str],
+        return_date_to: Union[datetime, date, str],
+        min_days: int = 0,
+        max_days: Optional[int] = None,
+        max_price: Optional[float] = None,
+        destination_country: Optional[str] = None,
+        destination_airport: Optional[str] = None,
+        outbound_departure_time_from: Union[str, time] = "00:00",
+        outbound_departure_time_to: Union[str, time] = "23:59",
+        inbound_departure_time_from: Union[str, time] = "00:00",
+        inbound_departure_time_to: Union[str, time] = "23:59",
+        window_days: int = 1,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> List[Trip]:
+        """
+        Finds return trips of flexible length by fetching one-way fares and joining them locally, instead of
+        querying return fares for every combination of outbound and return dates.
+
+        Outbound fares are fetched once per window of window_days days, and inbound fares back to source_airport
+        once per window for each destination found, all concurrently. That's a handful of queries for a few
+        destinations (restrict them with destination_country or destination_airport). Each query gives the cheapest
+        flight per destination over its window, so with window_days=1 every trip found is the cheapest for its
+        destination and pair of dates, as a return fares query for just those dates would give.
+
+        Args:
+            min_days (int): Minimum number of days between the outbound and inbound departure dates.
+            max_days (int): Maximum number of days between them.
+            max_price (float): Maximum total price of a trip.
+            window_days (int): Number of days covered by each one-way query.
+            max_workers (int): Maximum number of queries in flight at once.
+
+        Returns:
+            list: The trips, cheapest first.
+        """
+        outbound_shards = planning.shard_date_range(date_from, date_to, window_days)
+        outbound = self._fan_out(
+            lambda shard: self.get_cheapest_flights(
+                source_airport,
+                *shard,
+                destination_country=destination_country,
+                departure_time_from=outbound_departure_time_from,
+                departure_time_to=outbound_departure_time_to,
+                max_price=max_price,
+                destination_airport=destination_airport,
+            ),
+            outbound_shards,
+            max_workers,
+        )
+        outbound = [flight for _, flights in outbound for flight in flights]
+
+        return_shards = planning.shard_date_range(
+            return_date_from, return_date_to, window_days
+        )
+        destinations = dict.fromkeys(flight.destination for flight in outbound)
+        inbound = self._fan_out(
+            lambda key: self.get_cheapest_flights(
+                key[0],
+                *key[1],
+                departure_time_from=inbound_departure_time_from,
+                departure_time_to=inbound_departure_time_to,
+                max_price=max_price,
+                destination_airport=source_airport,
+            ),
+            [(airport, shard) for airport in destinations for shard in return_shards],
+            max_workers,
+        )
+        inbound = [flight for _, flights in inbound for flight in flights]
+
+        return tripjoin.join_trips(outbound, inbound, min_days, max_days, max_price)
+
+    def get_cheapest_fares_per_day(
+        self,
+        origin: str,
+        destination: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> FareCalendar:
+        """
+        Gets the cheapest one-way fare on each day from date_from to date_to on a route. The API gives a month per
+        query, so the months are fetched concurrently (and cached, if the client has a cache).
+
+        Returns:
+            dict: The cheapest fare (a DayFare) by day, in day order, for the days with a fare available.
+        """
+        return self._cheapest_fares_per_day(
+            [(origin, destination, date_from, date_to)], max_workers
+        )[0]
+
+    def get_best_return_days(
+        self,
+        origin: str,
+        destination: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        min_days: int,
+        max_days: int,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> List[DayPair]:
+        """
+        Finds the cheapest pair of outbound and return days, for every outbound day from date_from to date_to, for
+        trips between min_days and max_days days long, from the cheapest fare on each day in both directions.
+
+        Every month of both directions' fares is fetched concurrently, and the pairs are then found in a single pass
+        over the days (see ryanair.farecalendar.best_pairs), rather than with a return fares query per pair of dates.
+
+        Returns:
+            list: The cheapest pair (a DayPair) for each outbound day which has one, in day order.
+        """
+        date_from, date_to = planning.to_date(date_from), planning.to_date(date_to)
+        outbound, inbound = self._cheapest_fares_per_day(
+            [
+                (origin, destination, date_from, date_to),
+                (
+                    destination,
+                    origin,
+                    date_from + timedelta(days=min_days),
+                    date_to + timedelta(days=max_days),
+                ),
+            ],
+            max_workers,
+        )
+        return farecalendar.best_pairs(outbound, inbound, min_days, max_days)
+
+    def get_route_graph(self) -> RouteGraph:
+        """
+        The route network, built from get_active_airports. It's kept by the client, and rebuilt once a day.
+        """
+        with self._route_graph_lock:
+            if self._route_graph is None or self._route_graph[0] <= monotonic():
+                graph = RouteGraph.from_active_airports(self.get_active_airports())
+                self._route_graph = (monotonic() + DEFAULT_TTLS["locate"], graph)
+            return self._route_graph[1]
+
+    def get_cheapest_itineraries(
+        self,
+        origin: str,
+        destination: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+        max_stops: int = 2,
+        min_connection: timedelta = routegraph.DEFAULT_MIN_CONNECTION,
+        max_layover: timedelta = routegraph.DEFAULT_MAX_LAYOVER,
+        limit: int = 10,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> List[Itinerary]:
+        """
+        Finds the cheapest ways from origin to destination, leaving from date_from to date_to, including ones with up
+        to max_stops self-transfers (and direct flights, if there are any).
+
+        The cheapest fare on each day of every route which could be part of such an itinerary is fetched with
+        get_cheapest_fares_per_day, all concurrently, and the itineraries are then found with a search over the
+        flights (see ryanair.routegraph.cheapest_itineraries). With a cache, repeated searches only cost that search.
+
+        Args:
+            max_stops (int): Maximum number of connections.
+            min_connection (timedelta): Minimum time between landing and the next flight leaving.
+            max_layover (timedelta): Maximum time between landing and the next flight leaving.
+            limit (int): Maximum number of itineraries to return.
+            max_workers (int): Maximum number of queries in flight at once.
+
+        Returns:
+            list: Up to `limit` itineraries, cheapest first.
+        """
+        date_from, date_to = planning.to_date(date_from), planning.to_date(date_to)
+        routes = self.get_route_graph().routes_between(origin, destination, max_stops)
+        # Later flights can leave up to a layover (after a flight of under a day) later for each stop
+        last_day = date_to + max_stops * (max_layover + timedelta(days=1))
+        calendars = self._cheapest_fares_per_day(
+            [(a, b, date_from, last_day) for a, b in routes], max_workers
+        )
+        legs = [
+            Leg.from_day_fare(a, b, fare)
+            for (a, b), calendar in zip(routes, calendars)
+            for fare in calendar.values()
+        ]
+        return routegraph.cheapest_itineraries(
+            legs,
+            origin,
+            destination,
+            date_from,
+            date_to,
+            max_stops,
+            min_connection,
+            max_layover,
+            limit,
+        )
+
+    def _cheapest_fares_per_day(self, routes: list, max_workers: int) -> list:
+        # All months of all routes in one go, so none waits on another route's months
+        keys = [
+            (origin, destination, month)
+            for origin, destination, date_from, date_to in routes
+            for month in farecalendar.months_between(
+                planning.to_date(date_from), planning.to_date(date_to)
+            )
+        ]
+        months = dict(self._fan_out(self._cheapest_fares_in_month, keys, max_workers))
+
+        calendars = []
+        for origin, destination, date_from, date_to in routes:
+            date_from, date_to = planning.to_date(date_from), planning.to_date(date_to)
+            calendar = {}
+            for month in farecalendar.months_between(date_from, date_to):
+                for day, fare in months[(origin, destination, month)].items():
+                    if date_from <= day <= date_to:
+                        calendar[day] = fare
+            calendars.append(calendar)
+        return calendars
+
+    def _cheapest_fares_in_month(self, key: Tuple[str, str, date]) -> FareCalendar:
+        origin, destination, month = key
+        query_url, params = self._cheapest_per_day_query(origin, destination, month)
+        month_end = (month + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        if not self._has_flights(origin, destination, month, month_end):
+            self.metrics.increment(endpoint_name(query_url), "pruned")
+            return {}
+        return self._parse_cheapest_per_day(self._query(query_url, params))
+
+    def _run_fare_query(self, query: planning.FareQuery) -> list:
+        if query.inbound is None:
+            return self.get_cheapest_flights(
+                query.origin, *query.outbound, **query.kwargs
+            )
+        return self.get_cheapest_return_flights(
+            query.origin, *query.outbound, *query.inbound, **query.kwargs
+        )
+
+    @staticmethod
+    def _fan_out(query: Callable, keys: Iterable, max_workers: int) -> Iterator[Tuple]:
+        # A generator, so the executor is only shut down once the caller exhausts or closes it
+        keys = list(dict.fromkeys(keys))
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(query, key): key for key in keys}
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            finally:
+                # Don't start queries nobody is waiting for any more
+                for future in futures:
+                    future.cancel()
+
+    def _query_fares(self, url, params):
+        # Queries for a route on dates it has no flights on are answered without asking the API
+        if self.availability is not None and params.get("arrivalAirportIataCode"):
+            origin = params["departureAirportIataCode"]
+            destination = params["arrivalAirportIataCode"]
+            legs = [
+                (
+                    origin,
+                    destination,
+                    params["outboundDepartureDateFrom"],
+                    params["outboundDepartureDateTo"],
+                )
+            ]
+            if "inboundDepartureDateFrom" in params:
+                legs.append(
+                    (
+                        destination,
+                        origin,
+                        params["inboundDepartureDateFrom"],
+                        params["inboundDepartureDateTo"],
+                    )
+                )
+            if not all(self._has_flights(*leg) for leg in legs):
+                self.metrics.increment(endpoint_name(url), "pruned")
+                return {"fares": []}
+        return self._query(url, params)
+
+    def _has_flights(
+        self,
+        origin: str,
+        destination: str,
+        date_from: Union[datetime, date, str],
+        date_to: Union[datetime, date, str],
+    ) -> bool:
+        """
+        Whether the route may have flights from date_from to date_to, i.e. unless the availability index says not.
+        """
+        if self.availability is None:
+            return True
+
+        availability = self.availability.get(origin, destination)
+        if availability is None:
+            try:
+                days = self.get_available_flight_dates(origin, destination)
+            except RyanairException as e:
+                # Not knowing is no reason to fail the search, so the query is sent anyway
+                logger.warning(f"Not pruning {origin}-{destination} queries: {e}")
+                return True
+            availability = self.availability.set(origin, destination, days)
+
+        return (
+            availability.narrow(planning.to_date(date_from), planning.to_date(date_to))
+            is not None
+        )
+
+    def _query(self, url, params=None):
+        response = self._get_cached(url, params)
+        if response is None:
+            # Identical queries already in flight on other threads share this one's response
+            response = self._in_flight.do(
+                request_key(url, params), lambda: self._fetch(url, params)
+            )
+        return response
+
+    def _fetch(self, url, params=None):
+        response = self._retryable_query(url, params)
+        self._set_cached(url, params, response)
+        return response
+
+    def _retryable_query(self, url, params=None):
+        return self._retrying_send_query(url, params)
+
+    def _send_query(self, url, params=None):
+        self.session_manager.ensure_session_cookie()
+
+        response = self._get(url, params)
+        if response.status_code in SESSION_EXPIRED_STATUS_CODES:
+            # Our session cookie may have gone stale, so get a fresh one and try once more
+            self._on_session_expired(response)
+            self.session_manager.refresh_session_cookie()
+            response = self._get(url, params)
+
+        self._check_response(response)
+        return decode_response(response)
+
+    def _get(self, url, params=None):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        self._count_query()
+        started = perf_counter()
+        try:
+            response = self.session.get(url, params=params)
+        except Exception:
+            self._observe_request(url, started)
+            raise
+        self._observe_request(url, started, response)
+        return response
+
     def get_airport_info(self, iata_code: str):
         url = f"{Ryanair.BASE_LOCATE_API_URL}autocomplete/airports"
         params = {"phrase": iata_code, "market": "en-gb"}
         try:
-            return self._retryable_query(url, params)
+            return copy.deepcopy(self._query(url, params))
         except Exception as e:
             raise RyanairException(f"Failed to fetch airport info: {e}")
 
     def get_active_airports(self):
-        url = "https://www.ryanair.com/api/views/locate/3/airports/en/active"
         try:
-            return self._retryable_query(url)
+            return copy.deepcopy(self._query(Ryanair.ACTIVE_AIRPORTS_URL))
         except Exception as e:
             raise RyanairException(f"Failed to fetch active airports: {e}")
- 
+
     def get_countries(self):
-        url = "https://www.ryanair.com/api/views/locate/3/countries/en"
         try:
-            return self._retryable_query(url)
+            return copy.deepcopy(self._query(Ryanair.COUNTRIES_URL))
         except Exception as e:
             raise RyanairException(f"Failed to fetch countries: {e}")
 
@@ -321,10 +1165,9 @@ class Ryanair:
         Returns:
             List[str]: A list of available dates in 'YYYY-MM-DD' format.
         """
-        url = f"https://www.ryanair.com/api/farfnd/v4/oneWayFares/{departure_airport}/{arrival_airport}/availabilities"
+        url = self._available_flight_dates_url(departure_airport, arrival_airport)
         try:
-            available_dates = self._retryable_query(url)
-            return available_dates
+            available_dates = self._query(url)
+            return copy.deepcopy(available_dates)
         except Exception as e:
             raise RyanairException(f"Failed to fetch available flight dates: {e}")
-
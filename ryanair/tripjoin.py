@@ -0,0 +1,73 @@
+"""
+Building return trips locally from one-way fares: outbound flights are hash-joined to inbound flights back from their
+destination, rather than asking the API for every combination of dates.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+
+from ryanair.types import Flight, Trip
+
+
+def join_trips(
+    outbound: Iterable[Flight],
+    inbound: Iterable[Flight],
+    min_days: int = 0,
+    max_days: Optional[int] = None,
+    max_price: Optional[float] = None,
+) -> List[Trip]:
+    """
+    Pairs each outbound flight with every inbound flight from its destination back to its origin, leaving between
+    min_days and max_days (inclusive, counted in calendar days) after it.
+
+    Args:
+        outbound: The outbound flights.
+        inbound: The inbound flights, from any of the outbound flights' destinations.
+        min_days: Minimum number of days between the outbound and inbound departure dates.
+        max_days: Maximum number of days between them, unlimited if None.
+        max_price: Maximum total price of a trip.
+
+    Returns:
+        list: The trips, cheapest first (then by outbound and inbound departure time).
+    """
+    # Inbound flights by route, ordered by departure, so the ones in range of each outbound flight are found by bisection
+    routes: Dict[tuple, List[Flight]] = {}
+    for flight in inbound:
+        routes.setdefault((flight.origin, flight.destination), []).append(flight)
+    departures = {}
+    for route, flights in routes.items():
+        flights.sort(key=lambda flight: flight.departureTime)
+        departures[route] = [flight.departureTime for flight in flights]
+
+    trips = []
+    for out in outbound:
+        route = (out.destination, out.origin)
+        flights = routes.get(route)
+        if not flights:
+            continue
+
+        times = departures[route]
+        day = out.departureTime.replace(hour=0, minute=0, second=0, microsecond=0)
+        # Never before the outbound flight, even when min_days is 0
+        start = max(
+            bisect_right(times, out.departureTime),
+            bisect_left(times, day + timedelta(days=min_days)),
+        )
+        end = (
+            len(times)
+            if max_days is None
+            else bisect_left(times, day + timedelta(days=max_days + 1))
+        )
+        for back in flights[start:end]:
+            price = out.price + back.price
+            if max_price is None or price <= max_price:
+                trips.append(Trip(totalPrice=price, outbound=out, inbound=back))
+
+    trips.sort(
+        key=lambda trip: (
+            trip.totalPrice,
+            trip.outbound.departureTime,
+            trip.inbound.departureTime,
+        )
+    )
+    return trips
@@ -2,8 +2,22 @@ from dataclasses import dataclass
 from datetime import datetime
 
 
+# Flights and trips are slotted, as analyses can keep millions of them in memory
+
+
 @dataclass
 class Flight:
+    __slots__ = (
+        "departureTime",
+        "flightNumber",
+        "price",
+        "currency",
+        "origin",
+        "originFull",
+        "destination",
+        "destinationFull",
+    )
+
     departureTime: datetime
     flightNumber: str
     price: float
@@ -13,9 +27,50 @@ class Flight:
     destination: str
     destinationFull: str
 
+    def freeze(self) -> "FrozenFlight":
+        return FrozenFlight(*(getattr(self, field) for field in self.__slots__))
+
 
 @dataclass
 class Trip:
+    __slots__ = ("totalPrice", "outbound", "inbound")
+
     totalPrice: float
     outbound: Flight
     inbound: Flight
+
+    def freeze(self) -> "FrozenTrip":
+        return FrozenTrip(
+            self.totalPrice, self.outbound.freeze(), self.inbound.freeze()
+        )
+
+
+@dataclass(frozen=True)
+class FrozenFlight:
+    """
+    An immutable, hashable Flight, e.g. for use in sets or as a dict key.
+    """
+
+    __slots__ = Flight.__slots__
+
+    departureTime: datetime
+    flightNumber: str
+    price: float
+    currency: str
+    origin: str
+    originFull: str
+    destination: str
+    destinationFull: str
+
+
+@dataclass(frozen=True)
+class FrozenTrip:
+    """
+    An immutable, hashable Trip.
+    """
+
+    __slots__ = Trip.__slots__
+
+    totalPrice: float
+    outbound: FrozenFlight
+    inbound: FrozenFlight
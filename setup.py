@@ -1,8 +1,33 @@
 #!/usr/bin/env python
+import importlib.util
 from setuptools import setup
+from setuptools.command.build_py import build_py
 from os import path
 
 this_directory = path.abspath(path.dirname(__file__))
+
+
+class BuildPyWithAirportData(build_py):
+    """
+    Also compiles airports.csv into airports.pickle, which loads far faster at runtime.
+    """
+
+    def run(self):
+        super().run()
+        csv_path = path.join(this_directory, "ryanair", "airports.csv")
+        if not path.exists(csv_path):
+            return
+        # Loaded by path, as importing the ryanair package would need its dependencies installed
+        spec = importlib.util.spec_from_file_location(
+            "airport_data", path.join(this_directory, "ryanair", "airport_data.py")
+        )
+        airport_data = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(airport_data)
+        airport_data.compile_airports(
+            csv_path, path.join(self.build_lib, "ryanair", "airports.pickle")
+        )
+
+
 with open(path.join(this_directory, "README.md"), encoding="utf-8") as f:
     long_description = f.read()
 
@@ -22,5 +47,7 @@ setup(
         "Operating System :: OS Independent",
     ],
     install_requires=["requests", "backoff"],
+    extras_require={"async": ["httpx"], "fast": ["orjson"], "table": ["numpy"]},
     package_data={"ryanair": ["airports.csv"]},
+    cmdclass={"build_py": BuildPyWithAirportData},
 )
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from ryanair import Ryanair
+from ryanair.planning import FareQuery
 
 api = Ryanair(currency="EUR")  # Euro currency, so could also be GBP etc. also
 
@@ -12,26 +13,32 @@ origin = "KUN"
 min_trip_duration = 7  # Define the minimum desired trip duration in days
 max_trip_duration = 10  # Define the maximum desired trip duration in days
 
-all_trips = []
-
-# Iterate over possible start dates within the range
+# One query per start date and trip duration, run concurrently. Each is kept to its own dates (max_days=1), as the API
+# only returns the cheapest trip to each destination, so a query covering several would miss trips of these durations
+queries = []
 current_date = from_date
 while current_date <= to_date - timedelta(days=min_trip_duration):
     for duration in range(min_trip_duration, max_trip_duration + 1):
         return_date = current_date + timedelta(days=duration)
         if return_date > to_date:
             break
-            
-        trips = api.get_cheapest_return_flights(origin, current_date, current_date, return_date, return_date)
-        
-        # Filter trips based on the desired trip duration
-        for trip in trips:
-            trip_duration = (trip.inbound.departureTime - trip.outbound.departureTime).days
-            if min_trip_duration <= trip_duration <= max_trip_duration:
-                all_trips.append(trip)
-    
+
+        queries.append(
+            FareQuery.round_trip(
+                origin, current_date, current_date, return_date, return_date
+            )
+        )
+
     current_date += timedelta(days=1)
 
+all_trips = []
+for trips in api.get_cheapest_fares_batch(queries, max_days=1):
+    # Filter trips based on the desired trip duration
+    for trip in trips:
+        trip_duration = (trip.inbound.departureTime - trip.outbound.departureTime).days
+        if min_trip_duration <= trip_duration <= max_trip_duration:
+            all_trips.append(trip)
+
 # Variable to determine sorting preference
 sort_by_price = True  # Set to False to sort by date
 
@@ -0,0 +1,210 @@
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from ryanair.airport_utils import Airport, AirportIndex, AirportDistances, _haversine
+from ryanair import airport_data, airport_utils
+from ryanair.ryanair import RyanairException
+from ryanair.types import Flight
+
+AIRPORTS = [
+    Airport(IATA_code="DUB", lat=53.4213, lng=-6.2701, location="IE-D,IE"),
+    Airport(IATA_code="ORK", lat=51.8413, lng=-8.4911, location="IE-CO,IE"),
+    Airport(IATA_code="BFS", lat=54.6575, lng=-6.2158, location="GB-NIR,GB"),
+    Airport(IATA_code="STN", lat=51.8850, lng=0.2350, location="GB-ENG,GB"),
+    Airport(IATA_code="VNO", lat=54.6341, lng=25.2858, location="LT-VL,LT"),
+    Airport(IATA_code="KUN", lat=54.9639, lng=24.0848, location="LT-KU,LT"),
+]
+
+
+def _random_airports(n):
+    rng = random.Random(0)
+    return [
+        Airport(
+            IATA_code=f"A{i}",
+            lat=rng.uniform(-90, 90),
+            lng=rng.uniform(-180, 180),
+            location="",
+        )
+        for i in range(n)
+    ]
+
+
+class TestAirportIndex(unittest.TestCase):
+    def test_within_radius(self):
+        index = AirportIndex(AIRPORTS)
+
+        results = index.within("DUB", 200)
+        self.assertEqual([a.IATA_code for a, _ in results], ["DUB", "BFS"])
+        self.assertAlmostEqual(results[1][1], 137, delta=1)
+
+        self.assertEqual(
+            [a.IATA_code for a, _ in index.within((54.9, 24.2), 150)], ["KUN", "VNO"]
+        )
+
+    def test_nearest(self):
+        index = AirportIndex(AIRPORTS)
+
+        results = index.nearest("VNO", k=2)
+        self.assertEqual([a.IATA_code for a, _ in results], ["VNO", "KUN"])
+        self.assertEqual(results[0][1], 0)
+        self.assertEqual(len(index.nearest("VNO", k=10)), len(AIRPORTS))
+        self.assertEqual(index.nearest("VNO", k=0), [])
+
+    def test_matches_brute_force(self):
+        airports = _random_airports(2000)
+        index = AirportIndex(airports)
+
+        for lat, lng in [(53, -6), (-33, 151), (89, 0), (0, 179.9)]:
+            distances = sorted(
+                (_haversine(lat, lng, a.lat, a.lng), a.IATA_code) for a in airports
+            )
+
+            nearest = index.nearest((lat, lng), k=5)
+            self.assertEqual(
+                [a.IATA_code for a, _ in nearest], [code for _, code in distances[:5]]
+            )
+            for (_, distance), (expected, _) in zip(nearest, distances):
+                self.assertAlmostEqual(distance, expected, places=6)
+
+            within = {a.IATA_code for a, _ in index.within((lat, lng), 1000)}
+            self.assertEqual(
+                within, {code for distance, code in distances if distance <= 1000}
+            )
+
+
+class TestAirportDistances(unittest.TestCase):
+    def test_between(self):
+        distances = AirportDistances(AIRPORTS)
+        result = distances.between(["DUB", "VNO", "DUB"], ["STN", "KUN", "DUB"])
+
+        dub, stn = AIRPORTS[0], AIRPORTS[3]
+        self.assertAlmostEqual(
+            result[0], _haversine(dub.lat, dub.lng, stn.lat, stn.lng), places=6
+        )
+        self.assertEqual(result[2], 0)
+
+        with self.assertRaises(KeyError):
+            distances.between(["DUB", "XXX"], ["STN", "STN"])
+        with self.assertRaises(KeyError):
+            distances.between(["dub"], ["STN"])
+
+    def test_between_with_codes_of_other_lengths(self):
+        airports = AIRPORTS + [
+            Airport(IATA_code="X1", lat=0, lng=0, location=""),
+            Airport(IATA_code="", lat=1, lng=1, location=""),
+        ]
+        distances = AirportDistances(airports)
+        np.testing.assert_allclose(
+            distances.between(["DUB", "X1"], ["STN", "X1"]),
+            [AirportDistances(AIRPORTS).between(["DUB"], ["STN"])[0], 0],
+        )
+        with self.assertRaises(KeyError):
+            distances.between(["XXX"], ["STN"])
+
+    def test_for_flights(self):
+        flight = Flight(None, "FR 1", 10, "EUR", "DUB", "", "ORK", "")
+        distances = AirportDistances(AIRPORTS).for_flights([flight, flight])
+        self.assertEqual(len(distances), 2)
+        self.assertAlmostEqual(distances[0], 231, delta=1)
+
+    def test_matrix_is_cached_on_disk(self):
+        distances = AirportDistances(AIRPORTS)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "distances.npy")
+
+        matrix = distances.matrix(path)
+        self.assertEqual(matrix.shape, (len(AIRPORTS), len(AIRPORTS)))
+        self.assertEqual(matrix.dtype, np.float32)
+        self.assertIsInstance(matrix, np.memmap)
+
+        a, b = distances.indices(["DUB", "VNO"]), distances.indices(["STN", "KUN"])
+        np.testing.assert_allclose(
+            distances.matrix(path)[a, b],
+            distances.between(["DUB", "VNO"], ["STN", "KUN"]),
+            rtol=1e-6,
+        )
+
+    def test_matrix_file_is_replaced_whole(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "distances.npy")
+
+        old = AirportDistances(AIRPORTS[:2]).matrix(path)
+        matrix = AirportDistances(AIRPORTS).matrix(path)
+        self.assertEqual(matrix.shape, (len(AIRPORTS), len(AIRPORTS)))
+        # The outdated matrix other processes may have mapped is left as it was
+        self.assertEqual(old.shape, (2, 2))
+        self.assertAlmostEqual(float(old[0, 1]), 231, delta=1)
+        self.assertEqual(os.listdir(directory.name), ["distances.npy"])
+
+
+CSV = """iata_code,latitude_deg,longitude_deg,iso_region,iso_country
+DUB,53.4213,-6.2701,IE-D,IE
+VNO,54.6341,25.2858,LT-VL,LT
+"""
+
+
+class TestLoadAirports(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        for name, value in (("_DATA_DIRECTORY", self.directory), ("AIRPORTS", None)):
+            patcher = patch.object(airport_utils, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _write_csv(self):
+        path = os.path.join(self.directory, "airports.csv")
+        with open(path, "w", encoding="utf8") as f:
+            f.write(CSV)
+        return path
+
+    def test_loads_from_csv(self):
+        self._write_csv()
+        airports = airport_utils.load_airports()
+        self.assertEqual(airports["VNO"].location, "LT-VL,LT")
+        self.assertIs(airport_utils.load_airports(), airports)
+
+    def test_loads_compiled_airports(self):
+        csv_path = self._write_csv()
+        airport_data.compile_airports(
+            csv_path, os.path.join(self.directory, "airports.pickle")
+        )
+        os.remove(csv_path)
+
+        airports = airport_utils.load_airports()
+        self.assertEqual(airports["DUB"], Airport("DUB", 53.4213, -6.2701, "IE-D,IE"))
+
+    def test_missing_data_fails_loudly(self):
+        with self.assertRaises(RyanairException):
+            airport_utils.load_airports()
+        self.assertIsNone(airport_utils.AIRPORTS)
+
+    def test_concurrent_loads_read_the_data_once(self):
+        self._write_csv()
+        read_csv = airport_data.read_csv
+
+        def slow_read_csv(path):
+            time.sleep(0.05)
+            return read_csv(path)
+
+        with patch.object(airport_data, "read_csv", side_effect=slow_read_csv) as mock:
+            threads = [
+                threading.Thread(target=airport_utils.load_airports) for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        mock.assert_called_once()
+        self.assertEqual(len(airport_utils.AIRPORTS), 2)
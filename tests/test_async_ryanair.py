@@ -0,0 +1,88 @@
+import datetime
+import unittest
+
+import httpx
+
+from ryanair import AsyncRyanair
+from ryanair.ryanair import RyanairException
+from ryanair.types import Flight
+from tests.test_ryanair import MOCKED_ONE_WAY_RESPONSE, MOCKED_RETURN_RESPONSE
+
+
+def _mock_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestAsyncRyanair(unittest.IsolatedAsyncioTestCase):
+    async def test_get_cheapest_flights(self):
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            if request.url.path.endswith("oneWayFares"):
+                return httpx.Response(200, json=MOCKED_ONE_WAY_RESPONSE)
+            return httpx.Response(200)
+
+        async with AsyncRyanair("EUR", client=_mock_client(handler)) as api:
+            flights = await api.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+
+        self.assertEqual(
+            flights[0],
+            Flight(
+                departureTime=datetime.datetime(2023, 8, 23, 8, 20),
+                flightNumber="FR 504",
+                price=17.68,
+                currency="EUR",
+                origin="DUB",
+                originFull="Dublin, Ireland",
+                destination="BRS",
+                destinationFull="Bristol, United Kingdom",
+            ),
+        )
+        self.assertEqual(len(flights), 2)
+        self.assertEqual(requests_seen[-1].url.params["currency"], "EUR")
+        self.assertEqual(api.num_queries, 1)
+
+    async def test_get_cheapest_return_flights(self):
+        def handler(request):
+            return httpx.Response(200, json=MOCKED_RETURN_RESPONSE)
+
+        async with AsyncRyanair(client=_mock_client(handler)) as api:
+            trips = await api.get_cheapest_return_flights(
+                "DUB", "2023-09-01", "2023-09-15", "2023-09-16", "2023-09-30"
+            )
+
+        self.assertEqual([trip.totalPrice for trip in trips], [36.35, 39.11])
+        self.assertEqual(trips[0].inbound.origin, "LBA")
+
+    async def test_retryable_query_retries_on_failure_5_times(self):
+        def handler(request):
+            if request.url.host == "www.ryanair.com":
+                return httpx.Response(200)
+            return httpx.Response(500)
+
+        async with AsyncRyanair(client=_mock_client(handler)) as api:
+            with self.assertRaises(httpx.HTTPStatusError):
+                await api.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+
+        self.assertEqual(api.num_queries, 5)
+
+    async def test_errors_wrapped_for_locate_endpoints(self):
+        def handler(request):
+            raise httpx.ConnectError("unreachable")
+
+        async with AsyncRyanair(client=_mock_client(handler)) as api:
+            with self.assertRaises(RyanairException):
+                await api.get_countries()
+
+    async def test_iter_cheapest_return_flights(self):
+        def handler(request):
+            return httpx.Response(200, json=MOCKED_RETURN_RESPONSE)
+
+        async with AsyncRyanair(client=_mock_client(handler)) as api:
+            trips = await api.iter_cheapest_return_flights(
+                "DUB", "2023-09-01", "2023-09-15", "2023-09-16", "2023-09-30"
+            )
+
+        self.assertEqual(next(trips).totalPrice, 36.35)
+        self.assertEqual([trip.totalPrice for trip in trips], [39.11])
@@ -0,0 +1,44 @@
+import datetime
+import unittest
+
+from ryanair.availability import AvailabilityIndex, RouteAvailability
+
+
+def _day(day):
+    return datetime.date(2023, 9, day)
+
+
+class TestRouteAvailability(unittest.TestCase):
+    def test_operating_days(self):
+        availability = RouteAvailability(["2023-09-03", "2023-09-10", _day(5)])
+
+        self.assertEqual(availability.days(), [_day(3), _day(5), _day(10)])
+        self.assertEqual(len(availability), 3)
+        self.assertIn(_day(5), availability)
+        self.assertNotIn(_day(4), availability)
+        self.assertNotIn(_day(1), availability)
+
+    def test_narrow(self):
+        availability = RouteAvailability([_day(3), _day(5), _day(10)])
+
+        self.assertEqual(availability.narrow(_day(1), _day(30)), (_day(3), _day(10)))
+        self.assertEqual(availability.narrow(_day(4), _day(9)), (_day(5), _day(5)))
+        self.assertIsNone(availability.narrow(_day(6), _day(9)))
+        self.assertIsNone(availability.narrow(_day(11), _day(30)))
+        self.assertIsNone(availability.narrow(_day(5), _day(4)))
+        self.assertIsNone(RouteAvailability([]).narrow(_day(1), _day(30)))
+
+
+class TestAvailabilityIndex(unittest.TestCase):
+    def test_entries_expire(self):
+        now = [0.0]
+        index = AvailabilityIndex(ttl=60, clock=lambda: now[0])
+
+        self.assertIsNone(index.get("DUB", "STN"))
+        index.set("DUB", "STN", ["2023-09-03"])
+        self.assertEqual(index.get("DUB", "STN").days(), [_day(3)])
+        self.assertIsNone(index.get("STN", "DUB"))
+
+        now[0] = 60
+        self.assertIsNone(index.get("DUB", "STN"))
+        self.assertEqual(len(index), 0)
@@ -0,0 +1,206 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch, Mock
+
+from ryanair import Ryanair
+from ryanair.cache import (
+    ResponseCache,
+    SQLiteResponseCache,
+    endpoint_name,
+    request_key,
+)
+from tests.test_ryanair import MOCKED_ONE_WAY_RESPONSE
+
+FARES_URL = "https://services-api.ryanair.com/farfnd/v4/oneWayFares"
+COUNTRIES_URL = "https://www.ryanair.com/api/views/locate/3/countries/en"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@patch("ryanair.SessionManager.SessionManager._update_session_cookie", new=Mock())
+class TestResponseCache(unittest.TestCase):
+    def test_endpoint_name(self):
+        self.assertEqual(endpoint_name(FARES_URL), "oneWayFares")
+        self.assertEqual(endpoint_name(COUNTRIES_URL), "locate")
+        self.assertEqual(
+            endpoint_name(
+                "https://www.ryanair.com/api/farfnd/v4/oneWayFares/DUB/STN/availabilities"
+            ),
+            "availabilities",
+        )
+
+    def test_request_key_ignores_param_order(self):
+        self.assertEqual(
+            request_key(FARES_URL, {"a": 1, "b": "2"}),
+            request_key(FARES_URL, {"b": 2, "a": "1"}),
+        )
+        self.assertEqual(request_key(FARES_URL, None), request_key(FARES_URL, {}))
+
+    def test_entries_expire_per_endpoint(self):
+        clock = FakeClock()
+        cache = ResponseCache(ttls={"oneWayFares": 10, "locate": 100}, clock=clock)
+        cache.set(FARES_URL, {"a": 1}, {"fares": []})
+        cache.set(COUNTRIES_URL, None, ["IE"])
+
+        clock.now = 50
+        self.assertIsNone(cache.get(FARES_URL, {"a": 1}))
+        self.assertEqual(cache.get(COUNTRIES_URL), ["IE"])
+
+        clock.now = 150
+        self.assertIsNone(cache.get(COUNTRIES_URL))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        cache.set(FARES_URL, {"a": 1}, 1)
+        cache.set(FARES_URL, {"a": 2}, 2)
+        cache.get(FARES_URL, {"a": 1})
+        cache.set(FARES_URL, {"a": 3}, 3)
+
+        self.assertEqual(cache.get(FARES_URL, {"a": 1}), 1)
+        self.assertIsNone(cache.get(FARES_URL, {"a": 2}))
+        self.assertEqual(cache.get(FARES_URL, {"a": 3}), 3)
+
+    def test_byte_budget(self):
+        cache = ResponseCache(max_entries=None, max_bytes=15)
+        cache.set(FARES_URL, {"a": 1}, "x" * 8)
+        cache.set(FARES_URL, {"a": 2}, "y" * 8)
+        self.assertIsNone(cache.get(FARES_URL, {"a": 1}))
+        self.assertEqual(cache.size_bytes, 10)
+
+        cache.set(FARES_URL, {"a": 3}, "z" * 100)
+        self.assertIsNone(cache.get(FARES_URL, {"a": 3}))
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_client_serves_repeated_queries_from_cache(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_ONE_WAY_RESPONSE
+        )
+
+        ryanair_instance = Ryanair(cache=ResponseCache())
+        first = ryanair_instance.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+        second = ryanair_instance.get_cheapest_flights(
+            "DUB", "2023-09-01", "2023-09-30"
+        )
+        ryanair_instance.get_cheapest_flights("STN", "2023-09-01", "2023-09-30")
+
+        self.assertEqual(first, second)
+        self.assertEqual(ryanair_instance.num_queries, 2)
+        self.assertEqual(ryanair_instance.num_cache_hits, 1)
+        self.assertEqual(ryanair_instance.num_cache_misses, 2)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_cached_responses_are_copied_for_callers(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = [
+            {"code": "IE", "name": "Ireland"}
+        ]
+
+        ryanair_instance = Ryanair(cache=ResponseCache())
+        ryanair_instance.get_countries()[0]["name"] = "Changed"
+
+        self.assertEqual(ryanair_instance.get_countries()[0]["name"], "Ireland")
+        self.assertEqual(ryanair_instance.num_cache_hits, 1)
+
+
+class TestSQLiteResponseCache(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "responses.sqlite")
+
+    def _cache(self, **kwargs):
+        cache = SQLiteResponseCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_responses_survive_a_restart(self):
+        self._cache().set(FARES_URL, {"a": 1}, MOCKED_ONE_WAY_RESPONSE)
+
+        self.assertEqual(
+            self._cache().get(FARES_URL, {"a": 1}), MOCKED_ONE_WAY_RESPONSE
+        )
+        self.assertIsNone(self._cache().get(FARES_URL, {"a": 2}))
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = self._cache(ttls={"oneWayFares": 10}, clock=clock)
+        cache.set(FARES_URL, None, {"fares": []})
+
+        clock.now = 9
+        self.assertEqual(cache.get(FARES_URL), {"fares": []})
+        clock.now = 10
+        self.assertIsNone(cache.get(FARES_URL))
+
+    def test_oldest_entries_are_evicted_over_size_cap(self):
+        clock = FakeClock()
+        cache = self._cache(max_bytes=None, clock=clock)
+        for i in range(3):
+            clock.now = i
+            cache.set(FARES_URL, {"a": i}, MOCKED_ONE_WAY_RESPONSE)
+        entry_size = cache.size_bytes // 3
+
+        cache.max_bytes = 2 * entry_size
+        clock.now = 3
+        cache.set(FARES_URL, {"a": 3}, MOCKED_ONE_WAY_RESPONSE)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(FARES_URL, {"a": 1}))
+        self.assertIsNotNone(cache.get(FARES_URL, {"a": 2}))
+        self.assertIsNotNone(cache.get(FARES_URL, {"a": 3}))
+
+    def test_running_size_matches_stored_responses(self):
+        clock = FakeClock()
+        cache = self._cache(ttls={"oneWayFares": 10}, clock=clock)
+
+        def stored_size():
+            return (
+                cache._connection()
+                .execute("SELECT COALESCE(SUM(size), 0) FROM responses")
+                .fetchone()[0]
+            )
+
+        cache.set(FARES_URL, {"a": 1}, MOCKED_ONE_WAY_RESPONSE)
+        cache.set(FARES_URL, {"a": 2}, {"fares": []})
+        cache.set(FARES_URL, {"a": 1}, {"fares": [1]})
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.size_bytes, stored_size())
+
+        clock.now = 10
+        cache.set(FARES_URL, {"a": 3}, {"fares": []})
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.size_bytes, stored_size())
+
+        # Databases from before the running total was kept start from their contents
+        with cache._connection() as connection:
+            connection.execute("DROP TABLE responses_size")
+        self.assertEqual(self._cache().size_bytes, stored_size())
+
+        cache.clear()
+        self.assertEqual(cache.size_bytes, 0)
+
+    def test_concurrent_writers(self):
+        caches = [self._cache(), self._cache()]
+
+        def write(cache, offset):
+            for i in range(20):
+                cache.set(FARES_URL, {"a": offset + i}, {"fares": [i]})
+            cache.close()
+
+        threads = [
+            threading.Thread(target=write, args=(cache, 100 * n))
+            for n, cache in enumerate(caches)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self._cache()), 40)
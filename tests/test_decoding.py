@@ -0,0 +1,31 @@
+import datetime
+import json
+import unittest
+from unittest.mock import patch, Mock
+
+from ryanair import decoding
+from ryanair.decoding import decode_response, parse_datetime, epoch_seconds
+from tests.test_ryanair import MOCKED_RETURN_RESPONSE
+
+
+class TestDecoding(unittest.TestCase):
+    def test_decodes_response_body(self):
+        response = Mock(content=json.dumps(MOCKED_RETURN_RESPONSE).encode())
+        self.assertEqual(decode_response(response), MOCKED_RETURN_RESPONSE)
+        response.json.assert_not_called()
+
+    def test_falls_back_without_orjson(self):
+        response = Mock(content=b"{}")
+        response.json.return_value = {"fares": []}
+        with patch.object(decoding, "orjson", None):
+            self.assertEqual(decode_response(response), {"fares": []})
+
+    def test_invalid_json_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            decode_response(Mock(content=b"<html>"))
+
+    def test_timestamps_are_memoized(self):
+        first = parse_datetime("2023-08-23T08:20:00.000")
+        self.assertEqual(first, datetime.datetime(2023, 8, 23, 8, 20))
+        self.assertIs(parse_datetime("2023-08-23T08:20:00.000"), first)
+        self.assertEqual(epoch_seconds("1970-01-02T00:00:00.000"), 86400)
@@ -0,0 +1,75 @@
+import datetime
+import random
+import unittest
+
+from ryanair.farecalendar import DayFare, best_pairs, months_between
+
+START = datetime.date(2023, 9, 1)
+
+
+def _calendar(prices, hour=8):
+    calendar = {}
+    for offset, price in enumerate(prices):
+        if price is None:
+            continue
+        day = START + datetime.timedelta(days=offset)
+        departure = datetime.datetime.combine(day, datetime.time(hour))
+        calendar[day] = DayFare(
+            day, price, "EUR", departure, departure + datetime.timedelta(hours=2)
+        )
+    return calendar
+
+
+class TestBestPairs(unittest.TestCase):
+    def test_cheapest_return_for_each_day(self):
+        outbound = _calendar([10, 20, None, 5])
+        inbound = _calendar([None, 30, 8, 9, 8, 50, 1])
+
+        pairs = best_pairs(outbound, inbound, min_days=1, max_days=2)
+        self.assertEqual(
+            [(p.outbound.day.day, p.inbound.day.day, p.totalPrice) for p in pairs],
+            [(1, 3, 18), (2, 3, 28), (4, 5, 13)],
+        )
+        self.assertEqual(best_pairs(outbound, inbound, 3, 2), [])
+
+    def test_same_day_return_must_leave_after_landing(self):
+        outbound = _calendar([10])
+        # The outbound flight lands at 10:00
+        too_early = best_pairs(outbound, _calendar([1, 5], hour=9), 0, 1)
+        self.assertEqual(too_early[0].totalPrice, 15)
+        later = best_pairs(outbound, _calendar([1, 5], hour=11), 0, 1)
+        self.assertEqual(later[0].totalPrice, 11)
+
+    def test_matches_brute_force(self):
+        rng = random.Random(0)
+        for _ in range(20):
+            outbound = _calendar([rng.choice([None, *range(5, 50)]) for _ in range(60)])
+            inbound = _calendar([rng.choice([None, *range(5, 50)]) for _ in range(75)])
+            min_days, max_days = rng.randint(1, 5), rng.randint(5, 15)
+
+            expected = []
+            for day, out in sorted(outbound.items()):
+                returns = [
+                    (fare.price, fare.day)
+                    for fare in inbound.values()
+                    if min_days <= (fare.day - day).days <= max_days
+                ]
+                if returns:
+                    price, return_day = min(returns)
+                    expected.append((day, return_day, out.price + price))
+
+            pairs = best_pairs(outbound, inbound, min_days, max_days)
+            self.assertEqual(
+                [(p.outbound.day, p.inbound.day, p.totalPrice) for p in pairs],
+                expected,
+            )
+
+    def test_months_between(self):
+        self.assertEqual(
+            months_between(datetime.date(2023, 11, 15), datetime.date(2024, 1, 1)),
+            [
+                datetime.date(2023, 11, 1),
+                datetime.date(2023, 12, 1),
+                datetime.date(2024, 1, 1),
+            ],
+        )
@@ -0,0 +1,95 @@
+import datetime
+import unittest
+
+import numpy as np
+
+from ryanair.faretable import FareTable
+from ryanair.ryanair import _RyanairBase
+from ryanair.types import Flight, Trip
+from tests.test_ryanair import MOCKED_ONE_WAY_RESPONSE, MOCKED_RETURN_RESPONSE
+
+
+def _flight(origin, destination, price, day):
+    return Flight(
+        departureTime=datetime.datetime(2023, 9, day, 8, 20),
+        flightNumber="FR 1",
+        price=price,
+        currency="EUR",
+        origin=origin,
+        originFull=origin,
+        destination=destination,
+        destinationFull=destination,
+    )
+
+
+class TestFareTable(unittest.TestCase):
+    def setUp(self):
+        self.flights = [
+            _flight("DUB", "STN", 30, 1),
+            _flight("DUB", "BGY", 10, 2),
+            _flight("DUB", "STN", 20, 3),
+            _flight("DUB", "BCN", 40, 4),
+        ]
+        self.table = FareTable.from_flights(self.flights)
+
+    def test_filter_and_sort(self):
+        cheap = self.table.filter(self.table["price"] < 35).sort()
+        self.assertEqual(cheap["destination"].tolist(), ["BGY", "STN", "STN"])
+        self.assertEqual(cheap.items()[0], self.flights[1])
+
+        latest = self.table.sort(by="departure_time", descending=True)
+        self.assertEqual(latest["price"].tolist(), [40, 20, 10, 30])
+
+    def test_top_k(self):
+        self.assertEqual(self.table.top_k(2)["price"].tolist(), [10, 20])
+        self.assertEqual(self.table.top_k(10)["price"].tolist(), [10, 20, 30, 40])
+
+        to_stansted = self.table["destination"] == "STN"
+        self.assertEqual(
+            self.table.top_k(1, where=to_stansted).items(), [self.flights[2]]
+        )
+
+    def test_group_by_and_cheapest_by_destination(self):
+        groups = self.table.group_by("destination")
+        self.assertEqual(list(groups), ["BCN", "BGY", "STN"])
+        self.assertEqual(groups["STN"]["price"].tolist(), [30, 20])
+
+        cheapest = self.table.cheapest_by("destination")
+        self.assertEqual(cheapest["destination"].tolist(), ["BGY", "STN", "BCN"])
+        self.assertEqual(cheapest["price"].tolist(), [10, 20, 40])
+
+    def test_from_trips(self):
+        trips = [
+            Trip(50, self.flights[0], _flight("STN", "DUB", 20, 5)),
+            Trip(25, self.flights[1], _flight("BGY", "DUB", 15, 3)),
+        ]
+        table = FareTable.from_trips(trips)
+
+        self.assertEqual(table["price"].tolist(), [50, 25])
+        self.assertEqual(
+            table["duration"].tolist(),
+            [datetime.timedelta(days=4), datetime.timedelta(days=1)],
+        )
+        long_trips = table.filter(table["duration"] >= np.timedelta64(2, "D"))
+        self.assertEqual(long_trips.items(), [trips[0]])
+
+    def test_empty_table(self):
+        table = FareTable.from_flights([])
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.group_by(), {})
+        self.assertEqual(len(table.cheapest_by()), 0)
+
+    def test_from_response_matches_from_objects(self):
+        trips = _RyanairBase()._parse_cheapest_return_flights(MOCKED_RETURN_RESPONSE)
+        from_objects = FareTable.from_trips(trips)
+        from_response = FareTable.from_trips_response(MOCKED_RETURN_RESPONSE)
+
+        self.assertEqual(set(from_response.columns), set(from_objects.columns))
+        for name, column in from_objects.columns.items():
+            np.testing.assert_array_equal(from_response[name], column)
+
+        flights = FareTable.from_flights_response(MOCKED_ONE_WAY_RESPONSE)
+        self.assertEqual(flights["destination"].tolist(), ["BRS", "EDI"])
+        self.assertEqual(
+            flights["departure_time"][0], np.datetime64("2023-08-23T08:20:00")
+        )
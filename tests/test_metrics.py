@@ -0,0 +1,75 @@
+import json
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+
+from ryanair import Ryanair
+from ryanair.cache import ResponseCache
+from ryanair.metrics import Metrics
+from tests.test_ryanair import MOCKED_ONE_WAY_RESPONSE
+
+
+@patch("ryanair.SessionManager.SessionManager._update_session_cookie", new=Mock())
+class TestMetrics(unittest.TestCase):
+    def test_latency_histogram(self):
+        metrics = Metrics(latency_buckets=(0.1, 1))
+        metrics.observe_request("oneWayFares", 0.05, 100)
+        metrics.observe_request("oneWayFares", 0.5, 200)
+        metrics.observe_request("oneWayFares", 5, None)
+
+        snapshot = metrics.to_dict()["oneWayFares"]
+        self.assertEqual(snapshot["requests"], 3)
+        self.assertEqual(snapshot["errors"], 1)
+        self.assertEqual(snapshot["response_bytes"], 300)
+        self.assertEqual(snapshot["latency"]["buckets"], {"0.1": 1, "1": 2, "+Inf": 3})
+        self.assertAlmostEqual(snapshot["latency"]["sum"], 5.55)
+
+    def test_prometheus_format(self):
+        metrics = Metrics(latency_buckets=(1,))
+        metrics.observe_request("locate", 0.5, 10)
+        metrics.increment("locate", "cache_hits")
+
+        text = metrics.to_prometheus()
+        self.assertIn("# TYPE ryanair_requests_total counter", text)
+        self.assertIn('ryanair_requests_total{endpoint="locate"} 1', text)
+        self.assertIn('ryanair_cache_hits_total{endpoint="locate"} 1', text)
+        self.assertIn(
+            'ryanair_request_duration_seconds_bucket{endpoint="locate",le="+Inf"} 1',
+            text,
+        )
+        self.assertIn(
+            'ryanair_request_duration_seconds_count{endpoint="locate"} 1', text
+        )
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_client_records_queries(self, mock_get_session):
+        failed = Mock(status_code=503)
+        failed.raise_for_status.side_effect = requests.HTTPError(response=failed)
+        ok = Mock(status_code=200, content=json.dumps(MOCKED_ONE_WAY_RESPONSE).encode())
+        mock_get_session.return_value.get.side_effect = [failed, ok]
+
+        ryanair_instance = Ryanair(cache=ResponseCache())
+        ryanair_instance.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+        ryanair_instance.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+
+        metrics = ryanair_instance.metrics.to_dict()["oneWayFares"]
+        self.assertEqual(metrics["requests"], 2)
+        self.assertEqual(metrics["response_bytes"], len(ok.content))
+        self.assertEqual(metrics["retries"], 1)
+        self.assertEqual(metrics["giveups"], 0)
+        self.assertEqual(metrics["cache_hits"], 1)
+        self.assertEqual(metrics["cache_misses"], 1)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_client_records_giveups(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = requests.ConnectionError()
+
+        ryanair_instance = Ryanair()
+        with self.assertRaises(requests.ConnectionError):
+            ryanair_instance.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+
+        metrics = ryanair_instance.metrics.to_dict()["oneWayFares"]
+        self.assertEqual(metrics["errors"], 5)
+        self.assertEqual(metrics["retries"], 4)
+        self.assertEqual(metrics["giveups"], 1)
@@ -0,0 +1,156 @@
+import datetime
+import unittest
+
+from ryanair import planning
+from ryanair.types import Flight, Trip
+
+
+def _flight(destination, price, day):
+    return Flight(
+        departureTime=datetime.datetime(2023, 9, day, 8, 20),
+        flightNumber="FR 1",
+        price=price,
+        currency="EUR",
+        origin="DUB",
+        originFull="Dublin, Ireland",
+        destination=destination,
+        destinationFull=destination,
+    )
+
+
+class TestSharding(unittest.TestCase):
+    def test_shard_date_range(self):
+        self.assertEqual(
+            planning.shard_date_range("2023-09-01", "2023-09-17", 7),
+            [
+                (datetime.date(2023, 9, 1), datetime.date(2023, 9, 7)),
+                (datetime.date(2023, 9, 8), datetime.date(2023, 9, 14)),
+                (datetime.date(2023, 9, 15), datetime.date(2023, 9, 17)),
+            ],
+        )
+        self.assertEqual(
+            planning.shard_date_range(
+                datetime.datetime(2023, 9, 1, 12), datetime.date(2023, 9, 1), 7
+            ),
+            [(datetime.date(2023, 9, 1), datetime.date(2023, 9, 1))],
+        )
+        self.assertEqual(planning.shard_date_range("2023-09-02", "2023-09-01", 7), [])
+        with self.assertRaises(ValueError):
+            planning.shard_date_range("2023-09-01", "2023-09-30", 0)
+
+    def test_shard_return_windows_skips_impossible_pairs(self):
+        shards = planning.shard_return_windows(
+            "2023-09-01", "2023-09-20", "2023-09-05", "2023-09-30", 10
+        )
+        self.assertEqual(
+            planning.shard_return_windows(
+                "2023-09-15", "2023-09-20", "2023-09-01", "2023-09-30", 7
+            ),
+            [
+                ((datetime.date(2023, 9, 15), datetime.date(2023, 9, 20)), r)
+                for r in planning.shard_date_range("2023-09-15", "2023-09-30", 7)
+            ],
+        )
+        self.assertEqual(
+            [(outbound[0].day, inbound[0].day) for outbound, inbound in shards],
+            [(1, 5), (1, 15), (1, 25), (11, 5), (11, 15), (11, 25)],
+        )
+
+        # Every outbound day is paired with every return day on or after it
+        covered = set()
+        for (of, ot), (rf, rt) in shards:
+            covered.update(
+                (o, r)
+                for o in range(of.day, ot.day + 1)
+                for r in range(rf.day, rt.day + 1)
+            )
+        self.assertTrue(
+            {(o, r) for o in range(1, 21) for r in range(max(o, 5), 31)} <= covered
+        )
+
+
+class TestMergeFares(unittest.TestCase):
+    def test_keeps_cheapest_per_key(self):
+        results = [
+            [_flight("STN", 30, 1), _flight("BGY", 10, 2)],
+            [_flight("STN", 20, 9), _flight("BCN", 40, 10)],
+            [_flight("STN", 20, 16)],
+        ]
+        merged = planning.merge_fares(results, key=planning.flight_destination)
+        self.assertEqual(
+            [(f.destination, f.price, f.departureTime.day) for f in merged],
+            [("BGY", 10, 2), ("STN", 20, 9), ("BCN", 40, 10)],
+        )
+
+    def test_dedupes_without_key(self):
+        stansted = _flight("STN", 30, 1)
+        trip = Trip(50, stansted, _flight("DUB", 20, 5))
+        merged = planning.merge_fares(
+            [[trip, Trip(15, _flight("BGY", 10, 2), stansted)], [trip]]
+        )
+        self.assertEqual([t.totalPrice for t in merged], [15, 50])
+
+
+class TestCoveringQueries(unittest.TestCase):
+    def test_sweep_collapses_into_one_query(self):
+        # One query per start day and trip length, as in single.py
+        start = datetime.date(2023, 9, 1)
+        queries = [
+            planning.FareQuery.round_trip(
+                "KUN",
+                start + datetime.timedelta(days=day),
+                start + datetime.timedelta(days=day),
+                start + datetime.timedelta(days=day + length),
+                start + datetime.timedelta(days=day + length),
+                max_price=100,
+            )
+            for day in range(10)
+            for length in range(7, 11)
+        ]
+
+        plan = planning.plan_covering_queries(queries, max_days=31)
+        self.assertEqual(len(plan), 1)
+        cover, covered = plan[0]
+        self.assertEqual(sorted(covered), list(range(len(queries))))
+        self.assertEqual(
+            cover,
+            planning.FareQuery.round_trip(
+                "KUN",
+                "2023-09-01",
+                "2023-09-10",
+                "2023-09-08",
+                "2023-09-20",
+                max_price=100,
+            ),
+        )
+
+    def test_only_compatible_queries_are_combined(self):
+        queries = [
+            planning.FareQuery.one_way("DUB", "2023-09-01", "2023-09-05"),
+            planning.FareQuery.one_way("DUB", "2023-09-03", "2023-09-20"),
+            planning.FareQuery.one_way("DUB", "2023-09-25", "2023-10-05"),
+            planning.FareQuery.one_way("STN", "2023-09-01", "2023-09-05"),
+            planning.FareQuery.one_way("DUB", "2023-09-01", "2023-09-05", max_price=50),
+            planning.FareQuery.round_trip(
+                "DUB", "2023-09-01", "2023-09-05", "2023-09-06", "2023-09-10"
+            ),
+        ]
+
+        plan = planning.plan_covering_queries(queries, max_days=21)
+        self.assertEqual(
+            [(cover.outbound[1].day, covered) for cover, covered in plan],
+            [(20, [0, 1]), (5, [2]), (5, [3]), (5, [4]), (5, [5])],
+        )
+
+    def test_answer_from_cover(self):
+        query = planning.FareQuery.round_trip(
+            "DUB", "2023-09-01", "2023-09-02", "2023-09-05", "2023-09-06"
+        )
+        inside = Trip(50, _flight("STN", 30, 1), _flight("DUB", 20, 5))
+        outside = Trip(15, _flight("BGY", 10, 2), _flight("DUB", 5, 9))
+
+        self.assertEqual(planning.answer_from_cover(query, [inside]), ([inside], True))
+        self.assertEqual(
+            planning.answer_from_cover(query, [inside, outside]), ([inside], False)
+        )
+        self.assertFalse(query.contains(_flight("STN", 30, 1)))
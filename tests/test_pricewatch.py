@@ -0,0 +1,61 @@
+import unittest
+
+from ryanair.pricewatch import ADDED, REMOVED, REPRICED, PriceWatch, fare_key
+
+
+def _fare(flight_number, price, price_updated):
+    return {
+        "outbound": {
+            "flightKey": f"FR~{flight_number}~",
+            "flightNumber": f"FR{flight_number}",
+            "departureDate": "2023-08-23T08:20:00",
+            "price": {"value": price, "currencyCode": "EUR"},
+            "priceUpdated": price_updated,
+        }
+    }
+
+
+class TestPriceWatch(unittest.TestCase):
+    def setUp(self):
+        self.parsed = []
+
+    def parse(self, fare):
+        self.parsed.append(fare["outbound"]["flightNumber"])
+        return fare["outbound"]["price"]["value"]
+
+    def test_reports_only_changes(self):
+        watch = PriceWatch()
+        changes = watch.update("q", [_fare(1, 10, 100), _fare(2, 20, 100)], self.parse)
+        self.assertEqual([c.kind for c in changes], [ADDED, ADDED])
+        self.assertEqual(len(watch), 1)
+
+        self.parsed.clear()
+        self.assertEqual(
+            watch.update("q", [_fare(1, 10, 100), _fare(2, 20, 100)], self.parse), []
+        )
+        self.assertEqual(self.parsed, [])
+
+        # Fare 1 only had its timestamp bumped, 2 went up, 3 is new and 4 never was there
+        changes = watch.update(
+            "q", [_fare(1, 10, 200), _fare(2, 25, 200), _fare(3, 30, 200)], self.parse
+        )
+        self.assertEqual(
+            [(c.kind, c.key, c.old, c.new) for c in changes],
+            [(REPRICED, ("FR~2~",), 20, 25), (ADDED, ("FR~3~",), None, 30)],
+        )
+        self.assertEqual(self.parsed, ["FR2", "FR3"])
+
+        changes = watch.update("q", [_fare(3, 30, 200)], self.parse)
+        self.assertEqual(
+            [(c.kind, c.old) for c in changes], [(REMOVED, 10), (REMOVED, 25)]
+        )
+
+        # Queries are watched separately
+        self.assertEqual(len(watch.update("other", [_fare(3, 30, 200)], self.parse)), 1)
+        watch.forget("q")
+        self.assertEqual(len(watch.update("q", [_fare(3, 30, 200)], self.parse)), 1)
+
+    def test_fare_key(self):
+        fare = _fare(1, 10, 100)
+        fare["inbound"] = dict(fare["outbound"], flightKey=None)
+        self.assertEqual(fare_key(fare), ("FR~1~", "FR1~2023-08-23T08:20:00"))
@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+
+from ryanair import Ryanair
+from ryanair.ratelimit import RateLimiter
+from tests.test_cache import FakeClock
+
+
+@patch("ryanair.SessionManager.SessionManager._update_session_cookie", new=Mock())
+class TestRateLimiter(unittest.TestCase):
+    def test_burst_then_steady_rate(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rate=2, burst=3, clock=clock)
+
+        self.assertEqual([limiter._reserve() for _ in range(3)], [0, 0, 0])
+        self.assertEqual(limiter._reserve(), 0.5)
+        self.assertEqual(limiter._reserve(), 1.0)
+
+        clock.now = 10
+        self.assertEqual(limiter._reserve(), 0)
+
+    def test_slows_down_when_throttled_and_recovers(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rate=4, burst=4, increase=1, clock=clock)
+
+        limiter.on_throttled()
+        self.assertEqual(limiter.rate, 2)
+        # The saved up burst is dropped, so the next request has to wait
+        self.assertEqual(limiter._reserve(), 0.5)
+
+        limiter.on_throttled()
+        limiter.on_throttled()
+        limiter.on_throttled()
+        self.assertEqual(limiter.rate, 0.25)
+
+        for _ in range(10):
+            limiter.on_success()
+        self.assertEqual(limiter.rate, 4)
+
+    def test_rejects_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=0)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_client_reports_throttling(self, mock_get_session):
+        throttled = Mock(status_code=429)
+        throttled.raise_for_status.side_effect = requests.HTTPError()
+        ok = Mock(status_code=200)
+        ok.json.return_value = {"fares": []}
+        mock_get_session.return_value.get.side_effect = [throttled, ok]
+
+        limiter = RateLimiter(rate=10, burst=10, increase=1)
+        ryanair_instance = Ryanair(rate_limiter=limiter)
+        ryanair_instance.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+
+        self.assertEqual(limiter.rate, 6)
+        self.assertEqual(ryanair_instance.num_queries, 2)
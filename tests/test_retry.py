@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import patch, Mock
+
+import requests
+
+from ryanair import Ryanair
+from ryanair.ryanair import RyanairException
+from ryanair.retry import RetryPolicy, RetryBudget, is_transient, retry_after
+
+
+def _http_error(status_code, headers=None):
+    return requests.HTTPError(
+        response=Mock(status_code=status_code, headers=headers or {})
+    )
+
+
+def _waits(policy, exceptions):
+    waits = policy._waits()
+    next(waits)
+    return [waits.send(e) for e in exceptions]
+
+
+@patch("ryanair.SessionManager.SessionManager._update_session_cookie", new=Mock())
+class TestRetryPolicy(unittest.TestCase):
+    def test_only_transient_errors_are_retryable(self):
+        self.assertTrue(is_transient(requests.ConnectionError()))
+        self.assertTrue(is_transient(requests.ReadTimeout()))
+        self.assertTrue(is_transient(_http_error(503)))
+        self.assertTrue(is_transient(_http_error(429)))
+        self.assertFalse(is_transient(_http_error(400)))
+        self.assertFalse(is_transient(_http_error(404)))
+        self.assertFalse(is_transient(KeyError("fares")))
+
+    def test_retry_after(self):
+        self.assertEqual(retry_after(_http_error(429, {"Retry-After": "7"})), 7)
+        self.assertEqual(
+            retry_after(
+                _http_error(503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+            ),
+            0,
+        )
+        self.assertIsNone(retry_after(_http_error(503)))
+        self.assertIsNone(retry_after(requests.ConnectionError()))
+
+    def test_waits_are_jittered_and_honour_retry_after(self):
+        policy = RetryPolicy(base=1, cap=4)
+        waits = _waits(policy, [requests.ConnectionError()] * 4)
+        for wait, limit in zip(waits, [1, 2, 4, 4]):
+            self.assertTrue(0 <= wait <= limit)
+
+        waits = _waits(policy, [_http_error(429, {"Retry-After": "10"})])
+        self.assertEqual(waits, [10])
+
+    def test_gives_up_when_retry_after_is_too_long(self):
+        policy = RetryPolicy(max_retry_after=5)
+        with self.assertRaises(StopIteration):
+            _waits(policy, [_http_error(429, {"Retry-After": "3600"})])
+
+    def test_budget(self):
+        budget = RetryBudget(ratio=0.5, max_tokens=2)
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+        budget.deposit()
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_client_errors_are_not_retried(self, mock_get_session):
+        mock_response = Mock(status_code=400)
+        mock_response.raise_for_status.side_effect = _http_error(400)
+        mock_get_session.return_value.get.return_value = mock_response
+
+        ryanair_instance = Ryanair()
+        with self.assertRaises(requests.HTTPError):
+            ryanair_instance.get_cheapest_flights("XXX", "2023-09-01", "2023-09-30")
+        self.assertEqual(ryanair_instance.num_queries, 1)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_exhausted_budget_fails_fast(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = requests.ConnectionError()
+
+        policy = RetryPolicy(base=0, budget=RetryBudget(ratio=0, max_tokens=3))
+        ryanair_instance = Ryanair(retry_policy=policy)
+        for _ in range(3):
+            with self.assertRaises(RyanairException):
+                ryanair_instance.get_countries()
+
+        # 1 + 3 tries, then the budget is spent and each query is only tried once
+        self.assertEqual(ryanair_instance.num_queries, 6)
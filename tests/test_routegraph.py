@@ -0,0 +1,117 @@
+import datetime
+import itertools
+import random
+import unittest
+
+from ryanair.routegraph import Leg, RouteGraph, cheapest_itineraries
+
+ACTIVE_AIRPORTS = [
+    {"code": "KUN", "routes": ["airport:BGY", "airport:STN", "country:it"]},
+    {"code": "BGY", "routes": ["airport:KUN", "airport:BCN", "airport:DUB"]},
+    {"code": "STN", "routes": ["airport:KUN", "airport:DUB", "airport:BCN"]},
+    {"code": "DUB", "routes": ["airport:BCN", "airport:STN"]},
+    {"code": "BCN", "routes": ["airport:BGY"]},
+    {"code": "VNO", "routes": None},
+]
+
+
+def _leg(origin, destination, price, day, hour, hours=2):
+    departure = datetime.datetime(2023, 9, day, hour)
+    return Leg(
+        origin,
+        destination,
+        price,
+        "EUR",
+        departure,
+        departure + datetime.timedelta(hours=hours),
+    )
+
+
+class TestRouteGraph(unittest.TestCase):
+    def test_from_active_airports(self):
+        graph = RouteGraph.from_active_airports(ACTIVE_AIRPORTS)
+        self.assertEqual(len(graph), 6)
+        self.assertEqual(graph.destinations("KUN"), {"BGY", "STN"})
+        self.assertEqual(graph.destinations("VNO"), set())
+
+    def test_routes_between(self):
+        graph = RouteGraph.from_active_airports(ACTIVE_AIRPORTS)
+        self.assertEqual(graph.routes_between("KUN", "BCN", 0), [])
+        self.assertEqual(
+            sorted(graph.routes_between("KUN", "BCN", 1)),
+            [("BGY", "BCN"), ("KUN", "BGY"), ("KUN", "STN"), ("STN", "BCN")],
+        )
+        self.assertIn(("DUB", "BCN"), graph.routes_between("KUN", "BCN", 2))
+
+
+class TestCheapestItineraries(unittest.TestCase):
+    def test_connections_respect_min_and_max_layover(self):
+        legs = [
+            _leg("KUN", "BGY", 20, 1, 6),
+            _leg("BGY", "BCN", 10, 1, 9),  # Only an hour to connect
+            _leg("BGY", "BCN", 30, 1, 12),
+            _leg("BGY", "BCN", 5, 3, 12),  # Two days later
+            _leg("KUN", "BCN", 60, 1, 10),
+        ]
+        itineraries = cheapest_itineraries(
+            legs, "KUN", "BCN", datetime.date(2023, 9, 1), datetime.date(2023, 9, 1)
+        )
+        self.assertEqual(
+            [(i.totalPrice, i.stops) for i in itineraries], [(50, 1), (60, 0)]
+        )
+        self.assertEqual(itineraries[0].arrivalTime, datetime.datetime(2023, 9, 1, 14))
+
+        only_direct = cheapest_itineraries(
+            legs,
+            "KUN",
+            "BCN",
+            datetime.date(2023, 9, 1),
+            datetime.date(2023, 9, 1),
+            max_stops=0,
+        )
+        self.assertEqual([i.totalPrice for i in only_direct], [60])
+
+    def test_matches_exhaustive_search(self):
+        rng = random.Random(0)
+        airports = ["KUN", "BGY", "STN", "DUB", "BCN"]
+        legs = [
+            _leg(
+                *rng.sample(airports, 2),
+                rng.randint(5, 80),
+                rng.randint(1, 4),
+                rng.randint(5, 22)
+            )
+            for _ in range(150)
+        ]
+        min_connection = datetime.timedelta(hours=2)
+        max_layover = datetime.timedelta(hours=24)
+
+        expected = []
+        for n in range(1, 4):
+            for path in itertools.product(legs, repeat=n):
+                airports_visited = [path[0].origin] + [leg.destination for leg in path]
+                if (
+                    path[0].origin == "KUN"
+                    and path[-1].destination == "BCN"
+                    and path[0].departureTime.day <= 2
+                    and len(set(airports_visited)) == len(airports_visited)
+                    and all(
+                        a.destination == b.origin
+                        and min_connection
+                        <= b.departureTime - a.arrivalTime
+                        <= max_layover
+                        for a, b in zip(path, path[1:])
+                    )
+                ):
+                    expected.append(sum(leg.price for leg in path))
+        expected.sort()
+
+        itineraries = cheapest_itineraries(
+            legs,
+            "KUN",
+            "BCN",
+            datetime.date(2023, 9, 1),
+            datetime.date(2023, 9, 2),
+            limit=15,
+        )
+        self.assertEqual([i.totalPrice for i in itineraries], expected[:15])
@@ -1,3 +1,4 @@
+import copy
 import datetime
 import unittest
 from unittest import mock
@@ -7,6 +8,8 @@ from unittest.mock import patch, Mock, call
 import requests
 
 from ryanair import Ryanair
+from ryanair.availability import AvailabilityIndex
+from ryanair.planning import FareQuery
 from ryanair.types import Flight, Trip
 
 MOCKED_ONE_WAY_RESPONSE = {
@@ -266,6 +269,7 @@ MOCKED_RETURN_RESPONSE = {
 }
 
 
+@patch("ryanair.SessionManager.SessionManager._update_session_cookie", new=Mock())
 class TestRyanair(unittest.TestCase):
     @patch("ryanair.SessionManager.SessionManager.get_session")
     def test_initialization(self, mock_get_session):
@@ -750,6 +754,411 @@ class TestRyanair(unittest.TestCase):
             any_order=True,
         )
 
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_return_flights_many(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_RETURN_RESPONSE
+        )
+
+        ryanair_instance = Ryanair()
+        results = ryanair_instance.get_cheapest_return_flights_many(
+            ["DUB", "STN", "DUB", "BGY"],
+            "2023-09-01",
+            "2023-09-15",
+            "2023-09-16",
+            "2023-09-30",
+            max_workers=2,
+        )
+
+        self.assertEqual(list(results), ["DUB", "STN", "BGY"])
+        self.assertEqual([trip.totalPrice for trip in results["STN"]], [36.35, 39.11])
+        self.assertEqual(ryanair_instance.num_queries, 3)
+        departure_airports = {
+            c.kwargs["params"]["departureAirportIataCode"]
+            for c in mock_get_session.return_value.get.call_args_list
+        }
+        self.assertEqual(departure_airports, {"DUB", "STN", "BGY"})
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_return_flights_sharded(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_RETURN_RESPONSE
+        )
+
+        ryanair_instance = Ryanair()
+        trips = ryanair_instance.get_cheapest_return_flights_sharded(
+            "DUB",
+            "2023-09-01",
+            "2023-09-14",
+            "2023-09-01",
+            "2023-09-14",
+            shard_days=7,
+            max_price=100,
+        )
+
+        # Returns in the first week can't follow departures in the second, so that pair isn't queried
+        self.assertEqual(ryanair_instance.num_queries, 3)
+        windows = sorted(
+            (
+                c.kwargs["params"]["outboundDepartureDateFrom"],
+                c.kwargs["params"]["inboundDepartureDateFrom"],
+                c.kwargs["params"]["priceValueTo"],
+            )
+            for c in mock_get_session.return_value.get.call_args_list
+        )
+        self.assertEqual(
+            windows,
+            [
+                ("2023-09-01", "2023-09-01", 100),
+                ("2023-09-01", "2023-09-08", 100),
+                ("2023-09-08", "2023-09-08", 100),
+            ],
+        )
+        # Every shard returned the same two trips, which are merged back into one of each
+        self.assertEqual([trip.totalPrice for trip in trips], [36.35, 39.11])
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_fares_batch(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_RETURN_RESPONSE
+        )
+        start = datetime.date(2023, 8, 21)
+        queries = [
+            FareQuery.round_trip(
+                "DUB",
+                start + datetime.timedelta(days=day),
+                start + datetime.timedelta(days=day),
+                start + datetime.timedelta(days=day + length),
+                start + datetime.timedelta(days=day + length),
+            )
+            for day in range(4)
+            for length in (1, 2)
+        ]
+
+        ryanair_instance = Ryanair()
+        results = ryanair_instance.get_cheapest_fares_batch(queries, exact=False)
+
+        self.assertEqual(ryanair_instance.num_queries, 1)
+        params = mock_get_session.return_value.get.call_args.kwargs["params"]
+        self.assertEqual(
+            (params["outboundDepartureDateFrom"], params["inboundDepartureDateTo"]),
+            ("2023-08-21", "2023-08-26"),
+        )
+        # Both trips leave on the 23rd and return on the 24th
+        self.assertEqual([len(trips) for trips in results], [0, 0, 0, 0, 2, 0, 0, 0])
+
+        # Queries not provably complete are run on their own
+        ryanair_instance = Ryanair()
+        results = ryanair_instance.get_cheapest_fares_batch(queries)
+        self.assertEqual(ryanair_instance.num_queries, 1 + 7)
+        self.assertEqual([len(trips) for trips in results], [2] * 8)
+
+        # Queries kept to their own dates are each run once
+        ryanair_instance = Ryanair()
+        results = ryanair_instance.get_cheapest_fares_batch(queries, max_days=1)
+        self.assertEqual(ryanair_instance.num_queries, 8)
+        self.assertEqual([len(trips) for trips in results], [2] * 8)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_return_flights_joined(self, mock_get_session):
+        def respond(url, params=None, **kwargs):
+            # The same flights every day, out from Dublin and back from Bristol or Edinburgh
+            airport = params["departureAirportIataCode"]
+            fares = []
+            for fare in copy.deepcopy(MOCKED_ONE_WAY_RESPONSE["fares"]):
+                flight = fare["outbound"]
+                if airport != "DUB":
+                    flight["departureAirport"], flight["arrivalAirport"] = (
+                        flight["arrivalAirport"],
+                        flight["departureAirport"],
+                    )
+                if flight["departureAirport"]["iataCode"] == airport:
+                    flight["departureDate"] = (
+                        params["outboundDepartureDateFrom"]
+                        + flight["departureDate"][10:]
+                    )
+                    fares.append(fare)
+            response = Mock(status_code=200)
+            response.json.return_value = {"fares": fares}
+            return response
+
+        mock_get_session.return_value.get.side_effect = respond
+
+        ryanair_instance = Ryanair()
+        trips = ryanair_instance.get_cheapest_return_flights_joined(
+            "DUB", "2023-09-01", "2023-09-03", "2023-09-03", "2023-09-06", min_days=3
+        )
+
+        # 3 outbound days, then 4 return days from each of the 2 destinations
+        self.assertEqual(ryanair_instance.num_queries, 3 + 2 * 4)
+        self.assertEqual(
+            {
+                (t.outbound.departureTime.day, t.inbound.departureTime.day)
+                for t in trips
+            },
+            {(1, 4), (1, 5), (1, 6), (2, 5), (2, 6), (3, 6)},
+        )
+        self.assertEqual(len(trips), 2 * 6)
+        self.assertTrue(all(t.inbound.origin == t.outbound.destination for t in trips))
+        self.assertEqual(trips[0].totalPrice, 17.68 * 2)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_best_return_days(self, mock_get_session):
+        def respond(url, params=None, **kwargs):
+            # Fares every day, cheaper by the day out of Dublin and pricier by the day back to it
+            month = datetime.date.fromisoformat(params["outboundMonthOfDate"])
+            outbound = "/oneWayFares/DUB/" in url
+            fares = []
+            for offset in range(28):
+                day = month + datetime.timedelta(days=offset)
+                fares.append(
+                    {
+                        "day": day.isoformat(),
+                        "departureDate": f"{day}T08:00:00",
+                        "arrivalDate": f"{day}T10:00:00",
+                        "price": None
+                        if offset == 3
+                        else {
+                            "value": 100 - offset if outbound else 10 + offset,
+                            "currencyCode": "EUR",
+                        },
+                        "soldOut": False,
+                        "unavailable": offset == 3,
+                    }
+                )
+            response = Mock(status_code=200)
+            response.json.return_value = {"outbound": {"fares": fares}}
+            return response
+
+        mock_get_session.return_value.get.side_effect = respond
+
+        ryanair_instance = Ryanair(currency="EUR")
+        calendar = ryanair_instance.get_cheapest_fares_per_day(
+            "DUB", "STN", "2023-09-25", "2023-10-05"
+        )
+        self.assertEqual(ryanair_instance.num_queries, 2)
+        self.assertEqual(list(calendar)[0], datetime.date(2023, 9, 25))
+        self.assertNotIn(datetime.date(2023, 10, 4), calendar)
+        self.assertEqual(calendar[datetime.date(2023, 10, 5)].price, 96)
+
+        pairs = ryanair_instance.get_best_return_days(
+            "DUB", "STN", "2023-09-20", "2023-09-22", min_days=2, max_days=4
+        )
+        self.assertEqual(
+            [(p.outbound.day.day, p.inbound.day.day, p.totalPrice) for p in pairs],
+            [(20, 22, 81 + 31), (21, 23, 80 + 32), (22, 24, 79 + 33)],
+        )
+        urls = {c.args[0] for c in mock_get_session.return_value.get.call_args_list}
+        self.assertIn(
+            "https://services-api.ryanair.com/farfnd/v4/oneWayFares/STN/DUB/cheapestPerDay",
+            urls,
+        )
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_availability_prunes_queries(self, mock_get_session):
+        def respond(url, params=None, **kwargs):
+            response = Mock(status_code=200)
+            if url.endswith("/availabilities"):
+                # Dublin to Bristol flies on the 5th and 20th, Bristol to Dublin never
+                response.json.return_value = (
+                    ["2023-09-05", "2023-09-20"] if "/DUB/BRS/" in url else []
+                )
+            else:
+                response.json.return_value = MOCKED_ONE_WAY_RESPONSE
+            return response
+
+        mock_get_session.return_value.get.side_effect = respond
+
+        ryanair_instance = Ryanair(availability=AvailabilityIndex())
+        flights = ryanair_instance.get_cheapest_flights_sharded(
+            "DUB", "2023-09-01", "2023-09-30", destination_airport="BRS"
+        )
+        self.assertEqual(len(flights), 2)
+
+        # One availability query, then fare queries for the two weeks with flights
+        fare_queries = [
+            c.kwargs["params"]["outboundDepartureDateFrom"]
+            for c in mock_get_session.return_value.get.call_args_list
+            if c.kwargs.get("params")
+        ]
+        self.assertEqual(sorted(fare_queries), ["2023-09-01", "2023-09-15"])
+        self.assertEqual(ryanair_instance.num_queries, 3)
+        self.assertEqual(ryanair_instance.metrics.to_dict()["oneWayFares"]["pruned"], 3)
+
+        # Known routes aren't looked up again, and return trips need flights both ways
+        self.assertEqual(
+            ryanair_instance.get_cheapest_return_flights(
+                "DUB",
+                "2023-09-01",
+                "2023-09-30",
+                "2023-09-01",
+                "2023-09-30",
+                destination_airport="BRS",
+            ),
+            [],
+        )
+        self.assertEqual(ryanair_instance.num_queries, 4)
+
+        # Queries without a destination airport are always sent
+        ryanair_instance.get_cheapest_flights("DUB", "2023-09-06", "2023-09-07")
+        self.assertEqual(ryanair_instance.num_queries, 5)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_get_cheapest_itineraries(self, mock_get_session):
+        prices = {"KUN/BGY": (20, 6), "BGY/BCN": (10, 12), "KUN/BCN": (60, 10)}
+
+        def respond(url, params=None, **kwargs):
+            response = Mock(status_code=200)
+            if url == Ryanair.ACTIVE_AIRPORTS_URL:
+                response.json.return_value = [
+                    {"code": "KUN", "routes": ["airport:BGY", "airport:BCN"]},
+                    {"code": "BGY", "routes": ["airport:BCN"]},
+                    {"code": "BCN", "routes": []},
+                ]
+                return response
+            # The same flight every day of the month
+            price, hour = prices[url.split("/oneWayFares/")[1][:7]]
+            month = datetime.date.fromisoformat(params["outboundMonthOfDate"])
+            fares = []
+            for offset in range(30):
+                day = month + datetime.timedelta(days=offset)
+                fares.append(
+                    {
+                        "day": day.isoformat(),
+                        "departureDate": f"{day}T{hour:02}:00:00",
+                        "arrivalDate": f"{day}T{hour + 2:02}:00:00",
+                        "price": {"value": price, "currencyCode": "EUR"},
+                        "soldOut": False,
+                        "unavailable": False,
+                    }
+                )
+            response.json.return_value = {"outbound": {"fares": fares}}
+            return response
+
+        mock_get_session.return_value.get.side_effect = respond
+
+        ryanair_instance = Ryanair(currency="EUR")
+        itineraries = ryanair_instance.get_cheapest_itineraries(
+            "KUN", "BCN", "2023-09-01", "2023-09-01", max_stops=1
+        )
+        self.assertEqual(
+            [
+                [(leg.origin, leg.destination) for leg in itinerary.legs]
+                for itinerary in itineraries
+            ],
+            [[("KUN", "BGY"), ("BGY", "BCN")], [("KUN", "BCN")]],
+        )
+        # The next day's connection leaves more than a day after landing
+        self.assertEqual([i.totalPrice for i in itineraries], [30, 60])
+        # The airports, then a month of fares for each of the 3 routes
+        self.assertEqual(ryanair_instance.num_queries, 4)
+
+        # The route graph is kept
+        ryanair_instance.get_cheapest_itineraries(
+            "KUN", "BCN", "2023-09-02", "2023-09-02", max_stops=0
+        )
+        self.assertEqual(ryanair_instance.num_queries, 5)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_watch_cheapest_flights(self, mock_get_session):
+        responses = [copy.deepcopy(MOCKED_ONE_WAY_RESPONSE) for _ in range(2)]
+        repriced = responses[1]["fares"][0]["outbound"]
+        repriced["price"]["value"] = 19.99
+        repriced["priceUpdated"] += 60000
+        del responses[1]["fares"][1]
+
+        def respond(*args, **kwargs):
+            response = Mock(status_code=200)
+            response.json.return_value = responses.pop(0)
+            return response
+
+        mock_get_session.return_value.get.side_effect = respond
+
+        ryanair_instance = Ryanair()
+        added = ryanair_instance.watch_cheapest_flights(
+            "DUB", "2023-08-23", "2023-08-23"
+        )
+        self.assertEqual(
+            [(c.kind, c.new.destination) for c in added],
+            [("added", "BRS"), ("added", "EDI")],
+        )
+
+        changes = ryanair_instance.watch_cheapest_flights(
+            "DUB", "2023-08-23", "2023-08-23"
+        )
+        self.assertEqual(
+            [(c.kind, c.old.destination) for c in changes],
+            [("repriced", "BRS"), ("removed", "EDI")],
+        )
+        self.assertEqual((changes[0].old.price, changes[0].new.price), (17.68, 19.99))
+        self.assertIsNone(changes[1].new)
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_iter_cheapest_flights_many_propagates_errors(self, mock_get_session):
+        mock_get_session.return_value.get.side_effect = requests.HTTPError()
+
+        ryanair_instance = Ryanair()
+        with self.assertRaises(requests.HTTPError):
+            list(
+                ryanair_instance.iter_cheapest_flights_many(
+                    ["DUB", "STN"], "2023-09-01", "2023-09-30"
+                )
+            )
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_parsed_trips_are_compact(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_RETURN_RESPONSE
+        )
+
+        trips = Ryanair().get_cheapest_return_flights(
+            "DUB", "2023-09-01", "2023-09-15", "2023-09-16", "2023-09-30"
+        )
+
+        self.assertFalse(hasattr(trips[0], "__dict__"))
+        self.assertFalse(hasattr(trips[0].outbound, "__dict__"))
+        # Both trips leave from Dublin, so share one name string
+        self.assertIs(trips[0].outbound.originFull, trips[1].outbound.originFull)
+
+    def test_frozen_trips_are_hashable(self):
+        flight = Flight(
+            departureTime=datetime.datetime(2023, 8, 23, 8, 20),
+            flightNumber="FR 504",
+            price=17.68,
+            currency="EUR",
+            origin="DUB",
+            originFull="Dublin, Ireland",
+            destination="BRS",
+            destinationFull="Bristol, United Kingdom",
+        )
+        trip = Trip(totalPrice=35.36, outbound=flight, inbound=flight).freeze()
+
+        self.assertEqual(len({trip, Trip(35.36, flight, flight).freeze()}), 1)
+        self.assertEqual(trip.outbound.flightNumber, "FR 504")
+        with self.assertRaises(AttributeError):
+            trip.totalPrice = 0
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_iter_cheapest_flights_parses_lazily(self, mock_get_session):
+        mock_get_session.return_value.get.return_value.json.return_value = (
+            MOCKED_ONE_WAY_RESPONSE
+        )
+
+        ryanair_instance = Ryanair()
+        with patch.object(
+            ryanair_instance,
+            "_parse_cheapest_flight",
+            wraps=ryanair_instance._parse_cheapest_flight,
+        ) as parse:
+            flights = ryanair_instance.iter_cheapest_flights(
+                "DUB", "2023-09-01", "2023-09-30"
+            )
+            self.assertEqual(ryanair_instance.num_queries, 1)
+            parse.assert_not_called()
+
+            self.assertEqual(next(flights).destination, "BRS")
+            parse.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,184 @@
+import unittest
+from unittest.mock import patch, Mock
+
+import httpx
+import requests
+
+from ryanair import Ryanair, AsyncRyanair
+from ryanair.SessionManager import SessionManager, TimeoutHTTPAdapter
+from ryanair.ratelimit import RateLimiter
+from tests.test_ryanair import MOCKED_ONE_WAY_RESPONSE
+
+
+def _response(status_code, json=None):
+    response = Mock(status_code=status_code)
+    response.json.return_value = json
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+    return response
+
+
+def _reset_shared_cookies(test, cls):
+    for name, value in (("_shared_cookies", None), ("_shared_cookies_generation", 0)):
+        patcher = patch.object(cls, name, value)
+        patcher.start()
+        test.addCleanup(patcher.stop)
+
+
+class TestSessionManager(unittest.TestCase):
+    def setUp(self):
+        _reset_shared_cookies(self, SessionManager)
+
+        self.sessions = []
+
+        def new_session():
+            session = Mock()
+            session.get.return_value = _response(200, MOCKED_ONE_WAY_RESPONSE)
+            self.sessions.append(session)
+            return session
+
+        patcher = patch("ryanair.SessionManager.requests.Session", new_session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _urls_fetched(self, session):
+        return [c.args[0] for c in session.get.call_args_list]
+
+    def test_session_cookie_is_fetched_lazily(self):
+        ryanair_instance = Ryanair()
+        session = self.sessions[0]
+        session.get.assert_not_called()
+
+        ryanair_instance.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+        ryanair_instance.get_cheapest_flights("STN", "2023-09-01", "2023-09-30")
+
+        urls = self._urls_fetched(session)
+        self.assertEqual(urls.count(SessionManager.BASE_SITE_FOR_SESSION_URL), 1)
+        self.assertEqual(urls[0], SessionManager.BASE_SITE_FOR_SESSION_URL)
+        self.assertEqual(ryanair_instance.num_queries, 2)
+
+    def test_session_cookie_is_shared_between_clients(self):
+        first, second = Ryanair(), Ryanair()
+        first.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+        second.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+
+        first_session, second_session = self.sessions
+        self.assertIn(
+            SessionManager.BASE_SITE_FOR_SESSION_URL,
+            self._urls_fetched(first_session),
+        )
+        self.assertNotIn(
+            SessionManager.BASE_SITE_FOR_SESSION_URL,
+            self._urls_fetched(second_session),
+        )
+        second_session.cookies.update.assert_called_with(
+            first_session.cookies.copy.return_value
+        )
+
+    def test_session_cookie_is_refreshed_once_when_rejected(self):
+        limiter = RateLimiter(rate=10, burst=10, increase=1)
+        ryanair_instance = Ryanair(rate_limiter=limiter)
+        session = self.sessions[0]
+        session.get.side_effect = [
+            _response(200),
+            _response(403),
+            _response(200),
+            _response(200, MOCKED_ONE_WAY_RESPONSE),
+        ]
+
+        flights = ryanair_instance.get_cheapest_flights(
+            "DUB", "2023-09-01", "2023-09-30"
+        )
+
+        self.assertEqual(len(flights), 2)
+        self.assertEqual(
+            self._urls_fetched(session).count(SessionManager.BASE_SITE_FOR_SESSION_URL),
+            2,
+        )
+        self.assertEqual(ryanair_instance.num_queries, 2)
+        # The 403 may have been throttling, so the limiter slowed down before recovering
+        self.assertEqual(limiter.rate, 6)
+
+    def test_session_cookie_is_only_refreshed_once_per_attempt(self):
+        ryanair_instance = Ryanair()
+        session = self.sessions[0]
+        session.get.return_value = _response(401)
+
+        with self.assertRaises(requests.HTTPError):
+            ryanair_instance.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+
+        self.assertEqual(
+            self._urls_fetched(session).count(SessionManager.BASE_SITE_FOR_SESSION_URL),
+            2,
+        )
+        self.assertEqual(ryanair_instance.num_queries, 2)
+
+
+class TestSessionTransport(unittest.TestCase):
+    def test_pool_size_and_keep_alive(self):
+        session = SessionManager(pool_maxsize=64, keep_alive=False).get_session()
+        adapter = session.get_adapter("https://services-api.ryanair.com")
+
+        self.assertIsInstance(adapter, TimeoutHTTPAdapter)
+        self.assertEqual(adapter._pool_maxsize, 64)
+        self.assertEqual(session.headers["Connection"], "close")
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_default_timeout(self, mock_send):
+        adapter = TimeoutHTTPAdapter(timeout=(1, 2))
+        adapter.send(Mock())
+        self.assertEqual(mock_send.call_args.kwargs["timeout"], (1, 2))
+        adapter.send(Mock(), timeout=7)
+        self.assertEqual(mock_send.call_args.kwargs["timeout"], 7)
+
+    def test_custom_session(self):
+        session = requests.Session()
+        ryanair_instance = Ryanair(session_manager=SessionManager(session=session))
+        self.assertIs(ryanair_instance.session, session)
+
+
+class TestAsyncSessionCookies(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        _reset_shared_cookies(self, AsyncRyanair)
+
+    async def test_session_cookie_is_shared_between_clients(self):
+        session_requests = []
+
+        def handler(request):
+            if request.url.host == "www.ryanair.com":
+                session_requests.append(request)
+                return httpx.Response(200, headers={"Set-Cookie": "rid=abc"})
+            return httpx.Response(200, json=MOCKED_ONE_WAY_RESPONSE)
+
+        transport = httpx.MockTransport(handler)
+        async with AsyncRyanair(client=httpx.AsyncClient(transport=transport)) as first:
+            async with AsyncRyanair(
+                client=httpx.AsyncClient(transport=transport)
+            ) as second:
+                await first.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+                await second.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+
+                self.assertEqual(len(session_requests), 1)
+                self.assertEqual(second.client.cookies["rid"], "abc")
+
+    async def test_session_cookie_is_refreshed_once_when_rejected(self):
+        session_requests = []
+        fares_statuses = [403, 200]
+
+        def handler(request):
+            if request.url.host == "www.ryanair.com":
+                session_requests.append(request)
+                return httpx.Response(200)
+            return httpx.Response(fares_statuses.pop(0), json=MOCKED_ONE_WAY_RESPONSE)
+
+        limiter = RateLimiter(rate=10, burst=10, increase=1)
+        async with AsyncRyanair(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            rate_limiter=limiter,
+        ) as api:
+            flights = await api.get_cheapest_flights("DUB", "2023-09-01", "2023-09-30")
+
+        self.assertEqual(len(flights), 2)
+        self.assertEqual(len(session_requests), 2)
+        self.assertEqual(api.num_queries, 2)
+        self.assertEqual(limiter.rate, 6)
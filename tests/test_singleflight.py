@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, Mock
+
+from ryanair import Ryanair
+from ryanair.singleflight import SingleFlight, AsyncSingleFlight
+from tests.test_ryanair import MOCKED_ONE_WAY_RESPONSE
+
+
+@patch("ryanair.SessionManager.SessionManager._update_session_cookie", new=Mock())
+class TestSingleFlight(unittest.TestCase):
+    def _run_concurrently(self, single_flight, call, n=5):
+        # Only let the leader's call finish once every caller has joined it
+        release = threading.Event()
+
+        def blocking_call():
+            release.wait(timeout=5)
+            return call()
+
+        with ThreadPoolExecutor(max_workers=n) as executor:
+            futures = [
+                executor.submit(single_flight.do, "key", blocking_call)
+                for _ in range(n)
+            ]
+            while len(single_flight) == 0:
+                pass
+            # Give the other callers time to join the leader's call
+            time.sleep(0.1)
+            release.set()
+            return [future.exception() or future.result() for future in futures]
+
+    def test_concurrent_callers_share_one_call(self):
+        call = Mock(return_value={"fares": []})
+        results = self._run_concurrently(SingleFlight(), call)
+
+        self.assertEqual(results, [{"fares": []}] * 5)
+        call.assert_called_once()
+
+    def test_concurrent_callers_share_exception(self):
+        error = ValueError("bad gateway")
+        results = self._run_concurrently(SingleFlight(), Mock(side_effect=error))
+        self.assertEqual(results, [error] * 5)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        single_flight = SingleFlight()
+        call = Mock(return_value=1)
+        single_flight.do("key", call)
+        single_flight.do("key", call)
+        self.assertEqual(call.call_count, 2)
+        self.assertEqual(len(single_flight), 0)
+
+    def test_async_concurrent_callers_share_one_call(self):
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def main():
+            single_flight = AsyncSingleFlight()
+            return await asyncio.gather(
+                *(single_flight.do("key", call) for _ in range(5)),
+                single_flight.do("other", call),
+            )
+
+        self.assertEqual(asyncio.run(main()), ["result"] * 6)
+        self.assertEqual(len(calls), 2)
+
+    def test_async_leader_cancellation_does_not_cancel_followers(self):
+        async def call():
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def main():
+            single_flight = AsyncSingleFlight()
+            leader = asyncio.ensure_future(single_flight.do("key", call))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(single_flight.do("key", call))
+            await asyncio.sleep(0)
+            leader.cancel()
+            result = await follower
+            return leader.cancelled(), result, len(single_flight)
+
+        self.assertEqual(asyncio.run(main()), (True, "result", 0))
+
+    @patch("ryanair.SessionManager.SessionManager.get_session")
+    def test_client_coalesces_identical_queries(self, mock_get_session):
+        release = threading.Event()
+        response = Mock()
+        response.json.return_value = MOCKED_ONE_WAY_RESPONSE
+
+        def slow_get(*args, **kwargs):
+            release.wait(timeout=5)
+            return response
+
+        mock_get_session.return_value.get.side_effect = slow_get
+
+        ryanair_instance = Ryanair()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(
+                    ryanair_instance.get_cheapest_flights,
+                    "DUB",
+                    "2023-09-01",
+                    "2023-09-30",
+                )
+                for _ in range(4)
+            ]
+            while ryanair_instance.num_queries == 0:
+                pass
+            time.sleep(0.1)
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(len(results[0]), 2)
+        self.assertEqual(ryanair_instance.num_queries, 1)
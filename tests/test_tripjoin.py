@@ -0,0 +1,86 @@
+import datetime
+import random
+import unittest
+
+from ryanair.tripjoin import join_trips
+from ryanair.types import Flight
+
+
+def _flight(origin, destination, price, day, hour=8):
+    return Flight(
+        departureTime=datetime.datetime(2023, 9, day, hour),
+        flightNumber="FR 1",
+        price=price,
+        currency="EUR",
+        origin=origin,
+        originFull=origin,
+        destination=destination,
+        destinationFull=destination,
+    )
+
+
+class TestJoinTrips(unittest.TestCase):
+    def test_joins_by_destination_within_duration(self):
+        outbound = [_flight("DUB", "STN", 10, 1), _flight("DUB", "BGY", 20, 1)]
+        inbound = [
+            _flight("STN", "DUB", 15, 3),
+            _flight("STN", "DUB", 5, 8),
+            _flight("BGY", "DUB", 30, 4),
+            _flight("BGY", "VNO", 1, 4),
+            _flight("STN", "DUB", 1, 1, hour=6),
+        ]
+
+        trips = join_trips(outbound, inbound, min_days=2, max_days=3)
+        self.assertEqual(
+            [
+                (t.totalPrice, t.outbound.destination, t.inbound.departureTime.day)
+                for t in trips
+            ],
+            [(25, "STN", 3), (50, "BGY", 4)],
+        )
+
+        trips = join_trips(outbound, inbound)
+        self.assertEqual([t.totalPrice for t in trips], [15, 25, 50])
+        self.assertEqual(join_trips(outbound, inbound, max_price=20), [trips[0]])
+
+    def test_matches_nested_loop_join(self):
+        rng = random.Random(0)
+        airports = ["STN", "BGY", "BCN", "ORK"]
+        outbound = [
+            _flight(
+                "DUB",
+                rng.choice(airports),
+                rng.randint(5, 100),
+                rng.randint(1, 10),
+                rng.randint(0, 23),
+            )
+            for _ in range(200)
+        ]
+        inbound = [
+            _flight(
+                rng.choice(airports),
+                "DUB",
+                rng.randint(5, 100),
+                rng.randint(1, 20),
+                rng.randint(0, 23),
+            )
+            for _ in range(200)
+        ]
+
+        expected = sorted(
+            (out.price + back.price, out.departureTime, back.departureTime)
+            for out in outbound
+            for back in inbound
+            if back.origin == out.destination
+            and back.departureTime > out.departureTime
+            and 3 <= (back.departureTime.date() - out.departureTime.date()).days <= 5
+            and out.price + back.price <= 80
+        )
+        trips = join_trips(outbound, inbound, min_days=3, max_days=5, max_price=80)
+        self.assertEqual(
+            [
+                (t.totalPrice, t.outbound.departureTime, t.inbound.departureTime)
+                for t in trips
+            ],
+            expected,
+        )
@@ -1,8 +1,10 @@
 from datetime import datetime, timedelta
 from ryanair import Ryanair
-import time
+from ryanair.ratelimit import RateLimiter
 
-api = Ryanair(currency="EUR")  # Euro currency, so could also be GBP etc. also
+# Euro currency, so could also be GBP etc. also
+# The rate limiter spaces queries out, and backs off by itself if the API starts throttling us
+api = Ryanair(currency="EUR", rate_limiter=RateLimiter(rate=2, burst=4))
 
 # Hardcoded list of Lithuanian public holidays for 2025
 public_holidays = [
@@ -85,13 +87,11 @@ def search_flights(origin_country: str, destinations: list = None, max_price: in
         
         all_weekend_trips = []  # Collect all trips for this weekend
         
-        for origin in origin_airports:
-            trips = api.get_cheapest_return_flights(
-                origin, 
-                from_date, outbound_end,
-                return_start, return_end
-            )
-            
+        for origin, trips in api.iter_cheapest_return_flights_many(
+            origin_airports,
+            from_date, outbound_end,
+            return_start, return_end
+        ):
             for trip in trips:
                 # Check if destination is in the list of valid destinations
                 if destinations:
@@ -136,7 +136,6 @@ def search_flights(origin_country: str, destinations: list = None, max_price: in
                 print()
         
         from_date = from_date + timedelta(days=7)
-        time.sleep(1)
         print("====================")
 
 # Example usage: